@@ -1,7 +1,10 @@
-"""A Node object.
+"""Node objects.
 
-This module represents a node in a network.
+This module represents nodes in a network, either one Node object at a
+time or many at once in a columnar NodeList.
 """
+import numpy as np
+
 
 class Node:
     """Node class to store node and relevant information
@@ -24,4 +27,83 @@ class Node:
         return f"node {self.name}, radius {self.radius}"
     
     def __repr__(self):
-        return f"node {self.name}, radius {self.radius}, measure {self.measure}"
\ No newline at end of file
+        return f"node {self.name}, radius {self.radius}, measure {self.measure}"
+
+class NodeList:
+    """Columnar list of the nodes reached from a root
+
+    Stores one NumPy array per Node attribute instead of one Node object per
+    node. Iterating or indexing yields NodeView objects, so code written for
+    a list of Node objects keeps working.
+
+    Attributes:
+    ---------
+        names: list of node labels
+        ids: integer id of each node (CSR id when built from a search)
+        radii: lowest radius that each node is a part of
+        measures: assigned measure for each node
+        paths: list of shortest paths from source, or None if not kept
+        parents: position in the list of each node's BFS-tree parent, -1
+            for the root, or None if not kept
+    """
+
+    def __init__(self, names, radii, ids=None, paths=None, parents=None):
+        self.names = list(names)
+        self.radii = np.asarray(radii, dtype=np.int64)
+        self.ids = np.arange(len(self.names)) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.measures = np.zeros(len(self.names))
+        self.paths = paths
+        self.parents = None if parents is None else np.asarray(parents, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.names)
+        if not 0 <= i < len(self.names):
+            raise IndexError("NodeList index out of range")
+        return NodeView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self.names)):
+            yield NodeView(self, i)
+
+    def __repr__(self):
+        return f"NodeList of {len(self.names)} nodes, max radius {self.radii.max(initial=0)}"
+
+
+class NodeView:
+    """Node-like view of one entry of a NodeList"""
+
+    __slots__ = ('_nodes', '_i')
+
+    def __init__(self, nodes, i):
+        self._nodes = nodes
+        self._i = i
+
+    @property
+    def name(self):
+        return self._nodes.names[self._i]
+
+    @property
+    def radius(self):
+        return int(self._nodes.radii[self._i])
+
+    @property
+    def measure(self):
+        return self._nodes.measures[self._i]
+
+    @measure.setter
+    def measure(self, value):
+        self._nodes.measures[self._i] = value
+
+    @property
+    def path(self):
+        return [] if self._nodes.paths is None else self._nodes.paths[self._i]
+
+    def __str__(self):
+        return f"node {self.name}, radius {self.radius}"
+
+    def __repr__(self):
+        return f"node {self.name}, radius {self.radius}, measure {self.measure}"
@@ -9,28 +9,36 @@ import math
 import pandas as pd
 import numpy as np
 import numpy.linalg as la
-from rdd.Node import Node
+from scipy import sparse
+from rdd.Node import NodeList
+from rdd.csr import bfs_layers, bfs_tree, to_csr
+from rdd.crd import (crd_distance, crd_distances, crd_matrices_by_radius, crd_matrix,
+                     layers_to_node_list, measure_name, node_crd, node_crd_by_radius, node_crds,
+                     pairwise_rdd, radius_weights, sparse_pairwise_rdd)
+from rdd.ego import ego_graph
+from rdd.parallel import effective_n_jobs, parallel_rdd_matrix
 
 
 
 def populate_node_list(shortest_paths):
-    """Creates list of Node objects from list of shortest paths
+    """Creates a NodeList from list of shortest paths
 
     Args:
         shortest_paths: Dictionary of nodes and path from root to radius
 
     Returns:
-        node_list: list of Node objects with information added
+        node_list: NodeList with information added
 
     """
-    node_list = []
-    for node in shortest_paths:
-        n = Node()
-        n.name = node
-        n.path = shortest_paths[node]
-        n.radius = len(shortest_paths[node]) - 1
-        node_list.append(n)
-    return node_list
+    paths = list(shortest_paths.values())
+    return NodeList(shortest_paths.keys(), [len(path) - 1 for path in paths], paths=paths)
+
+
+def node_names(node_list):
+    """Get the labels of a NodeList or of a list of Node objects"""
+    if isinstance(node_list, NodeList):
+        return node_list.names
+    return [node.name for node in node_list]
 
         
 def add_measures(list_of_nodes, measures):
@@ -52,12 +60,15 @@ def get_crd(list_of_nodes):
 
     Args:
     ------
-        list_of_nodes : list of Node objects
+        list_of_nodes : NodeList or list of Node objects
 
     Returns:
     --------
         m: a defaultdict radius->radial distribution
     """
+    if isinstance(list_of_nodes, NodeList):
+        crd = np.cumsum(np.bincount(list_of_nodes.radii, weights=list_of_nodes.measures))
+        return defaultdict(int, enumerate(crd.tolist()))
     m = defaultdict(int)
     for n in list_of_nodes:
         m[n.radius] += n.measure
@@ -92,13 +103,23 @@ def rdd_default_scale(rdd, r, crd1, crd2):
     return rdd
 
 
-def get_rdd(crd1, crd2):
-    """Get the radial distribution distance for two CRDs"""
-    crd = get_crd_union(crd1, crd2)
-    r_dd = 0
-    for r in crd:
-        r_dd = rdd_default_scale(r_dd, r, crd1, crd2)
-    return r_dd
+def get_rdd(crd1, crd2, kernel=None):
+    """Get the radial distribution distance for two CRDs
+
+    Args:
+        crd1, crd2: CRDs from get_crd
+        kernel: radius weights from rdd.kernels, None for the exp(-r)
+            weights of rdd_default_scale
+
+    Returns:
+        the weighted sum of |crd1[r] - crd2[r]| over every radius of either CRD
+    """
+    radii = get_crd_union(crd1, crd2)
+    if not radii:
+        return 0
+    weights = radius_weights(max(radii) + 1, kernel)[radii]
+    diff = np.abs(np.array([crd1[r] for r in radii]) - np.array([crd2[r] for r in radii]))
+    return float(np.sum(weights * diff))
 
 
 def add_measures_to_node(list_nodes, measures):
@@ -106,9 +127,12 @@ def add_measures_to_node(list_nodes, measures):
 
     Args:
     ------
-        list_nodes : list of Node objects
+        list_nodes : NodeList or list of Node objects
         measures : list of values (floats)
     """
+    if isinstance(list_nodes, NodeList):
+        list_nodes.measures[:len(measures)] = measures
+        return
     for i in range(len(measures)):
         list_nodes[i].measure = measures[i]
 
@@ -160,7 +184,79 @@ def nodes_to_graph(network, node_list):
     return g
 
 
-def realworld_distance_compare(network, u, v, measure, radius, network2=None):
+def bfs_node_list(network, u, radius):
+    """Creates a NodeList of every node within radius of u
+
+    Gives the same nodes and radii as populate_node_list on the output of
+    nx.single_source_shortest_path, without building a path per node.
+
+    Args:
+        network: a networkx Graph object
+        u: root node
+        radius: the maximum radius, None for the whole component
+
+    Returns:
+        node_list: NodeList in BFS order
+    """
+    graph = to_csr(network)
+    order, dist, parent = bfs_tree(graph, graph.node_id(u), radius)
+    return layers_to_node_list(graph, order, dist, parent)
+
+
+def bfs_distances(network, u, radius):
+    """Get a dictionary node->hops from u for every node within radius, in BFS order"""
+    graph = to_csr(network)
+    order, dist = bfs_layers(graph, graph.node_id(u), radius)
+    return {graph.nodes[i]: r for i, r in zip(order.tolist(), dist.tolist())}
+
+
+def bfs_tree_graph(network, u, radius):
+    """Get the BFS tree of u up to radius as an nx.Graph() object
+
+    Same graph as paths_to_graph(nx.single_source_shortest_path(network, u, radius)),
+    built from the parent array of rdd.csr.bfs_tree. The root is kept even
+    when it has no neighbors.
+    """
+    graph = to_csr(network)
+    order, _, parent = bfs_tree(graph, graph.node_id(u), radius)
+    names = graph.nodes
+    g = nx.Graph()
+    g.add_node(u)
+    g.add_edges_from((names[p], names[c]) for p, c in zip(parent[1:].tolist(), order[1:].tolist()))
+    return g
+
+
+def bfs_tree_parents(network, node_list):
+    """Get the BFS tree that spans node_list as parent positions
+
+    Node lists built by the search (bfs_node_list, rdd.crd.node_crd) already
+    carry their tree. For other lists the root, the node at radius 0, is
+    searched again up to the largest radius of the list.
+
+    Args:
+        network: a networkx Graph object
+        node_list: NodeList or list of Node objects
+
+    Returns:
+        tuple: (parents, radii) arrays in node_list order, parents[i] is the
+        position of node i's parent in node_list, -1 for the root
+    """
+    if isinstance(node_list, NodeList) and node_list.parents is not None:
+        return node_list.parents, node_list.radii
+    names = node_names(node_list)
+    radii = np.array([node.radius for node in node_list], dtype=np.int64)
+    root = names[int(np.argmin(radii))]
+    graph = to_csr(network)
+    order, _, parent = bfs_tree(graph, graph.node_id(root), int(radii.max()))
+    position = {name: i for i, name in enumerate(names)}
+    parent_of = dict(zip(order.tolist(), parent.tolist()))
+    parents = np.array([-1 if parent_of[graph.index[name]] < 0
+                        else position[graph.nodes[parent_of[graph.index[name]]]]
+                        for name in names], dtype=np.int64)
+    return parents, radii
+
+
+def realworld_distance_compare(network, u, v, measure, radius, network2=None, kernel=None):
     """Compares the radial distribution distance between two nodes in a single or two graphs.
 
     Args
@@ -171,22 +267,19 @@ def realworld_distance_compare(network, u, v, measure, radius, network2=None):
         measure: a function that returns a list of values representing measures for each node
         radius: the maximum radius we want to compare with
         network2: Used if node v is from a different graph
+        kernel: radius weights from rdd.kernels, None for exp(-r)
 
     Returns:
     --------
         radial distribution distance value of u compared to v
 
     """
-    # Get the shortest paths for each node up to the specified radius
-    real_paths1 = nx.single_source_shortest_path(network, u, radius)
+    # Create a list of Node objects for each node up to the specified radius
+    node_list1 = bfs_node_list(network, u, radius)
     if network2:
-        real_paths2 = nx.single_source_shortest_path(network2, v, radius)
+        node_list2 = bfs_node_list(network2, v, radius)
     else:
-        real_paths2 = nx.single_source_shortest_path(network, v, radius)
-
-    # Create a list of Node objects from our shortest paths lists
-    node_list1 = populate_node_list(real_paths1)
-    node_list2 = populate_node_list(real_paths2)
+        node_list2 = bfs_node_list(network, v, radius)
 
     measures_u = measure(network, node_list1)
     if network2:
@@ -204,122 +297,219 @@ def realworld_distance_compare(network, u, v, measure, radius, network2=None):
 
     # each radial distribution must go up to the same threshold
     ensure_radial_parity(crd1, crd2)
-    return get_rdd(crd1, crd2)
+    return get_rdd(crd1, crd2, kernel)
+
+
+def rdd_by_radius(network, u, v, measure, radius, network2=None, kernel=None):
+    """Compares two nodes at every radius from 1 to radius at once
 
+    Each ball is searched once, to the largest radius, and the CRDs for the
+    smaller radii are read off the same layers.
 
-def get_rdds_for_visuals(network, u, measure, radius):
+    Args:
+        network: a networkx Graph object
+        u: first node
+        v: second node
+        measure: a function that returns a list of values representing measures for each node
+        radius (int): the largest radius to compare with
+        network2: Used if node v is from a different graph
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        ndarray: entry r - 1 is realworld_distance_compare(network, u, v, measure, r)
     """
+    graph = to_csr(network)
+    graph2 = graph if network2 is None else to_csr(network2)
+    crds1 = node_crd_by_radius(graph, u, measure, radius)
+    crds2 = node_crd_by_radius(graph2, v, measure, radius)
+    return np.array([crd_distance(crd1, crd2, kernel) for crd1, crd2 in zip(crds1, crds2)])
+
+
+VISUALS_COLUMNS = ['node_name', 'rdd', 'radius', 'degree']
+
+
+def visuals_vector_columns(measure_vector):
+    """Get the column names of get_rdds_for_visuals_vector for measure_vector"""
+    return ['node_name', 'radius', 'degree'] + [measure_name(m) for m in measure_vector] + ['normalized_rdd']
+
+
+def iter_rdds_for_visuals(network, u, measure, radius, batch_size=256, kernel=None):
+    """Yields the rows behind get_rdds_for_visuals in batches as they are computed
+
+    The CRD of u is built once and every other node is compared against it,
+    so memory stays bounded by one batch.
+
     Args:
         network: a networkx Graph object
         u: Node object from which the other nodes will be considered up to radius
         measure: measures to be used that influence RDD values
         radius: how many steps from root node to consider
+        batch_size: number of records per batch
+        kernel: radius weights from rdd.kernels, None for exp(-r)
 
-    Returns:
-        df: pandas dataframe of nodes and information
+    Yields:
+        list: up to batch_size (node, rdd, radius, degree) tuples, with the
+        raw rdd before get_rdds_for_visuals rescales it
 
     """
-    rdd_list = []
-    node_list = []
-    rad_list = []
-    degree_list = []
-
-    # Populate the lists used to construct dataframe of information from nodes
+    graph = to_csr(network)
+    crd_u = node_crd(graph, u, measure, radius)
+    batch = []
     for node in network:
-        r = realworld_distance_compare(network, u, node, measure, radius)
-        if r == 0:
-            rdd_list.append(0)
-        else:
-            # rdd_list.append(math.log(r, 10))
-            # rdd_list.append(np.tanh(r))
-            rdd_list.append(r)
-
-        # TODO Fix this - rad_list is broken - adding 1 just to make it work
-        # rad_list.append(len(shortest_paths[node]) - 1)
-        rad_list.append(1)
+        r = crd_distance(crd_u, node_crd(graph, node, measure, radius), kernel)
+        # TODO Fix this - radius is broken, see get_rdds_for_visuals
+        batch.append((node, r, 1, network.degree(node)))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-        node_list.append(node)
-        degree_list.append(network.degree(node))
-    d = {'node_name': node_list, 'rdd': rdd_list, 'radius': rad_list, 'degree': degree_list}
-    df = pd.DataFrame(d)
 
-    # df['rdd'] = normalize_rdd(df, 1, 1000, 'rdd')
-    df['rdd'] = np.log10(df['rdd'])
-    df['rdd'] = np.tanh(df['rdd'])
+def iter_rdds_for_visuals_vector(network, u, measure_vector, radius, batch_size=256,
+                                 kernel=None):
+    """Yields the rows of get_rdds_for_visuals_vector in batches as they are computed
 
-    return df
+    The CRDs of u are built once and each node's are built when its row is,
+    so memory stays bounded by one batch. rdd_vector_matrix returns the
+    same values as arrays in one call.
 
+    Args:
+        network: a networkx Graph object
+        u: Node object from which the other nodes will be considered up to radius
+        measure_vector: list of measure functions
+        radius: how many steps from root node to consider
+        batch_size: number of records per batch
+        kernel: radius weights from rdd.kernels, None for exp(-r)
 
-def get_rdds_for_visuals_vector(network, u, measure_vector, radius):
-    node_list = []
-    degree_list = []
-    rad_list = []
+    Yields:
+        list: up to batch_size tuples laid out as visuals_vector_columns,
+        (node, radius, degree, one rdd per measure, normalized_rdd)
 
-    # Populate and construct a DataFrame with basic node information
+    """
+    graph = to_csr(network)
+    crds_u = node_crds(graph, u, measure_vector, radius)
+    batch = []
     for node in network:
-        node_list.append(node)
-        degree_list.append(network.degree(node))
-        # TODO: Broken
-        rad_list.append(1)
-    df = pd.DataFrame({'node_name': node_list, 'radius': rad_list, 'degree': degree_list})
-
-    # Now iterate through the measures and add them as columns to the frame
-    measure_lists = []
-    for m in measure_vector:
-        rdd_list = []
-        for node in network:
-            r = realworld_distance_compare(network, u, node, m, radius)
-            rdd_list.append(r)
-        # we use __name__ to get the string name of the function
-        df[m.__name__] = rdd_list
-        measure_lists.append(rdd_list)
+        row = crd_distances(crds_u, node_crds(graph, node, measure_vector, radius), kernel)
+        # TODO: Broken radius
+        batch.append((node, 1, network.degree(node)) + tuple(row.tolist()) + (float(la.norm(row)),))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-    # for m in measure_vector:
-    # df[m.__name__] = normalize_rdd(df, 1, 1000, m.__name__)
-    # df[m.__name__] = np.log10(df[m.__name__])
-    df_norm = df[list(map(lambda f: f.__name__, measure_vector))]
-    df['normalized_rdd'] = la.norm(df_norm, axis=1)
-    #df['normalized_rdd'] = normalize_rdd(df, 1, 1000, 'normalized_rdd')
-    # df['normalized_rdd'] = np.log10(df['normalized_rdd'])
-    return df
 
-def get_rdds_for_visuals_vector_radius(network, u, measure_vector, radius):
-    node_list = []
-    degree_list = []
-    rad_list = []
+def rdd_vector_matrix(network, u, measure_vector, radius, nodes=None, kernel=None):
+    """Get the RDD between u and other nodes for several measures at once
 
-    real_paths1 = nx.single_source_shortest_path(network, u, radius)
+    Each node's ball is searched once and every measure is evaluated on
+    the same layers, instead of one pass over the graph per measure.
 
-    network = network.subgraph(list(real_paths1.keys()))
+    Args:
+        network: a networkx Graph object
+        u: Node object from which the other nodes will be considered up to radius
+        measure_vector: list of measure functions
+        radius: how many steps from root node to consider
+        nodes: nodes to compare u with, defaults to every node of network
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        tuple: (rdds, norms) where rdds[i, j] is the RDD between u and
+        nodes[i] for measure_vector[j] and norms[i] is the norm of row i,
+        the normalized_rdd of get_rdds_for_visuals_vector
+    """
+    graph = to_csr(network)
+    nodes = graph.nodes if nodes is None else nodes
+    crds_u = node_crds(graph, u, measure_vector, radius)
+    rdds = np.empty((len(nodes), len(measure_vector)))
+    for i, node in enumerate(nodes):
+        rdds[i] = crd_distances(crds_u, node_crds(graph, node, measure_vector, radius), kernel)
+    return rdds, la.norm(rdds, axis=1)
+
+
+class BatchSink:
+    """Collects record batches into a CSV file, a DataFrame, or both
+
+    Attributes:
+    ---------
+        columns: column names of the records
+        path: CSV file the batches are written to, None to skip the file
+        keep: whether appended batches are also kept in memory for frame
+    """
+
+    def __init__(self, columns, path=None, keep=None):
+        self.columns = list(columns)
+        self.path = path
+        self.keep = path is None if keep is None else keep
+        self._frames = []
+        self._written = False
+
+    def append(self, batch):
+        """Append one batch, the file is overwritten by the first batch
+
+        Returns:
+            DataFrame: the batch as a DataFrame
+        """
+        df = pd.DataFrame(batch, columns=self.columns)
+        if self.path is not None:
+            df.to_csv(self.path, mode='a' if self._written else 'w',
+                      header=not self._written, index=False)
+            self._written = True
+        if self.keep:
+            self._frames.append(df)
+        return df
+
+    def consume(self, batches):
+        """Append every batch from a generator such as iter_rdds_for_visuals"""
+        for batch in batches:
+            self.append(batch)
+        return self
+
+    @property
+    def frame(self):
+        """DataFrame of every batch kept so far"""
+        if not self._frames:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(self._frames, ignore_index=True)
+
+
+def get_rdds_for_visuals(network, u, measure, radius, kernel=None):
+    """
+    Args:
+        network: a networkx Graph object
+        u: Node object from which the other nodes will be considered up to radius
+        measure: measures to be used that influence RDD values
+        radius: how many steps from root node to consider
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        df: pandas dataframe of nodes and information
+
+    """
+    df = BatchSink(VISUALS_COLUMNS).consume(
+        iter_rdds_for_visuals(network, u, measure, radius, kernel=kernel)).frame
+
+    # df['rdd'] = normalize_rdd(df, 1, 1000, 'rdd')
+    df['rdd'] = np.log10(df['rdd'])
+    df['rdd'] = np.tanh(df['rdd'])
+
+    return df
 
-    # Populate and construct a DataFrame with basic node information
-    for node in network:
-        node_list.append(node)
-        degree_list.append(network.degree(node))
-        # TODO: Broken
-        rad_list.append(1)
-    df = pd.DataFrame({'node_name': node_list, 'radius': rad_list, 'degree': degree_list})
-
-    # Now iterate through the measures and add them as columns to the frame
-    measure_lists = []
-    for m in measure_vector:
-        rdd_list = []
-        for node in network:
-            r = realworld_distance_compare(network, u, node, m, radius)
-            rdd_list.append(r)
-        # we use __name__ to get the string name of the function
-        df[m.__name__] = rdd_list
-        measure_lists.append(rdd_list)
 
+def get_rdds_for_visuals_vector(network, u, measure_vector, radius, kernel=None):
+    df = BatchSink(visuals_vector_columns(measure_vector)).consume(
+        iter_rdds_for_visuals_vector(network, u, measure_vector, radius, kernel=kernel)).frame
     # for m in measure_vector:
     # df[m.__name__] = normalize_rdd(df, 1, 1000, m.__name__)
     # df[m.__name__] = np.log10(df[m.__name__])
-    df_norm = df[list(map(lambda f: f.__name__, measure_vector))]
-    df['normalized_rdd'] = la.norm(df_norm, axis=1)
-    # df['normalized_rdd'] = normalize_rdd(df, 1, 1000, 'normalized_rdd')
-    # df['normalized_rdd'] = np.log10(df['normalized_rdd'])
     return df
 
+def get_rdds_for_visuals_vector_radius(network, u, measure_vector, radius, kernel=None):
+    return get_rdds_for_visuals_vector(ego_graph(network, u, radius), u, measure_vector, radius,
+                                       kernel)
+
 def normalize_rdd(df, d_min, d_max, col):
     r_min = df[col].min()
     r_max = df[col].max()
@@ -331,14 +521,14 @@ def normalize_rdd(df, d_min, d_max, col):
 
 # TODO: Not working yet
 def get_rdds_for_visuals_diff_graph(network, u, measure, radius, network2):
-    shortest_paths = nx.single_source_shortest_path(network, u, radius)
+    distances = bfs_distances(network, u, radius)
     rdd_list = []
     node_list = []
     rad_list = []
     # used for single graph. Add multigraph later.
     for node in network:
         rdd_list.append(realworld_distance_compare(network, u, node, measure, radius))
-        rad_list.append(len(shortest_paths[node]) - 1)
+        rad_list.append(distances[node])
         node_list.append(node)
 
     d = {'node_name': node_list, 'rdd': rdd_list, 'radius': rad_list}
@@ -346,23 +536,132 @@ def get_rdds_for_visuals_diff_graph(network, u, measure, radius, network2):
     return df
 
 
-def get_rdd_matrix(G, r, measure):
+def get_rdd_matrix(G, r, measure, vectorized=False, block_size=64, n_jobs=None, kernel=None):
     """Get a matrix of RDD values between all nodes.
 
     Args:
         G (Graph): NetworkX Graph
         r (int): radius
         measure (function): A measure function
+        vectorized (bool): build every node's CRD once and compare all pairs
+            with NumPy instead of calling realworld_distance_compare n^2 times
+        block_size (int): rows per broadcast block when vectorized
+        n_jobs (int): run the vectorized mode on a process pool of this
+            size, -1 for every core (see rdd.parallel)
+        kernel: radius weights from rdd.kernels, None for exp(-r)
 
     Returns:
         DataFrame: a matrix of RDD values between all nodes.
     """
+    if effective_n_jobs(n_jobs) > 1:
+        rdd_matrix = pd.DataFrame(parallel_rdd_matrix(G, r, measure, n_jobs=n_jobs,
+                                                      block_size=block_size, kernel=kernel).T,
+                                  columns=list(G))
+        rdd_matrix.index += 1
+        return rdd_matrix
+
+    if vectorized:
+        crds, layers = crd_matrix(to_csr(G), measure, r)
+        rdd_matrix = pd.DataFrame(pairwise_rdd(crds, layers, block_size=block_size,
+                                               kernel=kernel).T,
+                                  columns=list(G))
+        rdd_matrix.index += 1
+        return rdd_matrix
+
     rdd_matrix = pd.DataFrame()
     for target_one in G:
         rdd_list = []
         for target_two in G:
             rdd_list.append(realworld_distance_compare(
-                G, target_one, target_two, measure, r))
+                G, target_one, target_two, measure, r, kernel=kernel))
         rdd_matrix[target_one] = rdd_list
     rdd_matrix.index += 1
     return rdd_matrix
+
+
+def get_sparse_rdd_matrix(G, r, measure, threshold=None, k=None, edge_list=False,
+                          block_size=64, kernel=None):
+    """Get the RDD between pairs of nodes, keeping only the small values
+
+    Pairs above threshold are pruned while their sum is built and no dense
+    n x n matrix is ever allocated (see rdd.crd.sparse_pairwise_rdd). Every
+    node is within RDD 0 of itself, so the diagonal is always kept unless
+    k excludes it through ties.
+
+    Args:
+        G (Graph): NetworkX Graph
+        r (int): radius
+        measure (function): A measure function
+        threshold (float): keep pairs whose RDD is at most threshold
+        k (int): keep the k smallest RDDs per node, ties broken by node order
+        edge_list (bool): return a list of (u, v, rdd) instead of a matrix
+        block_size (int): rows handled at once
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        scipy.sparse.csr_matrix: entry [i, j] is the RDD between the i-th and
+        j-th nodes of G, kept zeros are stored explicitly; or the edge list
+    """
+    graph = to_csr(G)
+    crds, layers = crd_matrix(graph, measure, r)
+    rows, cols, values = sparse_pairwise_rdd(crds, layers, threshold=threshold, k=k,
+                                             block_size=block_size, kernel=kernel)
+    if edge_list:
+        names = graph.nodes
+        return [(names[i], names[j], d) for i, j, d in zip(rows.tolist(), cols.tolist(),
+                                                           values.tolist())]
+    return sparse.csr_matrix((values, (rows, cols)), shape=(len(graph), len(graph)))
+
+
+def get_rdd_matrix_by_radius(G, radius, measure, block_size=64, kernel=None):
+    """Get the RDD between all pairs of nodes for every radius from 1 to radius
+
+    Costs one BFS per node instead of one get_rdd_matrix run per radius.
+
+    Args:
+        G (Graph): NetworkX Graph
+        radius (int): largest radius
+        measure (function): A measure function
+        block_size (int): rows per broadcast block, see rdd.crd.pairwise_rdd
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        ndarray: radius x n x n array, out[r - 1, i, j] is the RDD at radius r
+        between the i-th and j-th nodes of G
+    """
+    graph = to_csr(G)
+    out = np.empty((radius, len(graph), len(graph)))
+    for r, (crds, layers) in enumerate(crd_matrices_by_radius(graph, measure, radius)):
+        out[r] = pairwise_rdd(crds, layers, block_size=block_size, kernel=kernel)
+    return out
+
+
+def cross_rdd_matrix(G1, G2, measure, radius, align=False, block_size=64, kernel=None):
+    """Get a matrix of RDD values between the nodes of two graphs.
+
+    Each graph's CRDs are computed once, so this is the batched form of
+    realworld_distance_compare(G1, u, v, measure, radius, network2=G2).
+
+    Args:
+        G1 (Graph): NetworkX Graph holding the row nodes
+        G2 (Graph): NetworkX Graph holding the column nodes
+        measure (function): A measure function
+        radius (int): radius
+        align (bool): keep only labels found in both graphs, in G1 order,
+            on both axes, so entry [x, x] compares node x across the graphs
+        block_size (int): rows per broadcast block
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        DataFrame: entry [u, v] is the RDD between u in G1 and v in G2
+    """
+    graph1, graph2 = to_csr(G1), to_csr(G2)
+    nodes1, nodes2 = graph1.nodes, graph2.nodes
+    if align:
+        nodes1 = [node for node in nodes1 if node in graph2.index]
+        nodes2 = nodes1
+    crds1, layers1 = crd_matrix(graph1, measure, radius, nodes1)
+    crds2, layers2 = crd_matrix(graph2, measure, radius, nodes2)
+    return pd.DataFrame(pairwise_rdd(crds1, layers1, crds2, layers2, block_size=block_size,
+                                     kernel=kernel),
+                        index=nodes1, columns=nodes2)
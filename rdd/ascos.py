@@ -6,6 +6,7 @@ import networkx as nx
 import numpy
 import pandas as pd
 from rdd.measures import *
+from rdd.ego import ego_result
 
 # __all__ = ['ascos']
 
@@ -136,10 +137,7 @@ def get_ascos(G, u):
   return (df)
 
 def get_ascos_radius(G, u, r):
-  real_paths1 = nx.single_source_shortest_path(G, u, r)
-  g = G.subgraph(list(real_paths1.keys()))
-
-  nodes, sims = ascos(g)
+  nodes, sims = ego_result(G, u, r, 'ascos', ascos)
 
   my_nodes = []
   my_degrees = []
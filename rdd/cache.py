@@ -0,0 +1,76 @@
+"""Per-graph caches.
+
+This module memoises whole-graph results (global measures, CSR copies)
+so they are computed once per graph instead of once per comparison.
+Entries are keyed by graph identity and dropped as soon as the graph is
+mutated. That relies on the __networkx_cache__ hook of NetworkX >= 3.3;
+on older releases nothing is cached and every value is recomputed.
+"""
+
+
+def _root_graph(network):
+    """Follow subgraph / restricted views back to the graph that owns the data"""
+    while getattr(network, '_graph', None) is not None:
+        network = network._graph
+    return network
+
+
+def graph_version(network):
+    """Get a token that changes whenever network is mutated
+
+    NetworkX (>= 3.3) empties G.__networkx_cache__ on every structural change,
+    so a marker stored there disappears with it. Views share the marker of
+    the graph they look into. Older NetworkX releases have no such hook and
+    no other way to notice an edit that keeps the node and edge counts, so
+    there every call returns a new token and nothing counts as unchanged.
+
+    Args:
+        network: a networkx Graph or graph view
+
+    Returns:
+        a token, compare with == to see if the graph changed
+    """
+    root = _root_graph(network)
+    nx_cache = getattr(root, '__networkx_cache__', None)
+    if nx_cache is None:
+        return object()
+    return nx_cache.setdefault('rdd_version', object())
+
+
+def graph_cache(network):
+    """Get the cache dictionary of network for its current version
+
+    Args:
+        network: a networkx Graph or graph view
+
+    Returns:
+        dict: an empty dict after every mutation of network
+    """
+    version = graph_version(network)
+    entry = getattr(network, '_rdd_cache', None)
+    if entry is None or entry[0] != version:
+        entry = (version, {})
+        network._rdd_cache = entry
+    return entry[1]
+
+
+def cached(network, key, compute):
+    """Get a per-graph value, computing it only on the first request
+
+    Args:
+        network: a networkx Graph or graph view
+        key: hashable name of the value, e.g. 'pagerank'
+        compute: function with no arguments that builds the value
+
+    Returns:
+        the cached value
+    """
+    cache = graph_cache(network)
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+
+def clear_cache(network):
+    """Drop every cached value of network"""
+    network.__dict__.pop('_rdd_cache', None)
@@ -0,0 +1,25 @@
+"""Maximal clique index.
+
+The clique measures count the maximal cliques each node belongs to. Asking
+NetworkX node by node enumerates every maximal clique of the graph once per
+node (and cliques_containing_node is gone from recent NetworkX), so this
+module enumerates them once and counts them for all nodes together.
+"""
+from collections import Counter
+import networkx as nx
+
+
+def clique_counts(network):
+    """Count the maximal cliques containing each node
+
+    Args:
+        network: an undirected networkx Graph
+
+    Returns:
+        dict: node -> number of maximal cliques it belongs to, every node
+        is in at least one
+    """
+    counts = Counter()
+    for clique in nx.find_cliques(network):
+        counts.update(clique)
+    return {node: counts[node] for node in network}
@@ -10,6 +10,7 @@ import networkx as nx
 import pandas as pd
 import numpy as np
 from rdd.measures import *
+from rdd.ego import ego_result
 
 __author__ = """Hung-Hsuan Chen (hhchen@psu.edu)"""
 # __all__ = ['cosine']
@@ -95,10 +96,7 @@ def get_cosine(G, u):
     return df
 
 def get_cosine_radius(G, u, r):
-    real_paths1 = nx.single_source_shortest_path(G, u, r)
-    g = G.subgraph(list(real_paths1.keys()))
-
-    sims = cosine(g)
+    sims = ego_result(G, u, r, 'cosine', cosine)
 
     my_nodes = []
     my_degree = []
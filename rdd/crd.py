@@ -0,0 +1,374 @@
+"""Array based Cumulative Radial Distributions.
+
+This module computes CRDs and Radial Distribution Distance (RDD) values
+on top of rdd.csr. A CRD is a 1-D NumPy array whose entry r holds the
+total measure of all nodes within r hops of the root.
+"""
+import functools
+import numpy as np
+from rdd.Node import NodeList
+from rdd.cache import cached
+from rdd.csr import bfs_tree, to_csr
+from rdd.kernels import DEFAULT_KERNEL
+
+
+def radius_weights(length, kernel=None):
+    """Get the weight of radius 0 to length - 1
+
+    Args:
+        length (int): number of radii
+        kernel: a kernel from rdd.kernels, None for the exp(-r) weights
+            used by rdd.RDD.rdd_default_scale
+
+    Returns:
+        ndarray: weights
+    """
+    return (DEFAULT_KERNEL if kernel is None else kernel)(length)
+
+
+def layers_to_node_list(graph, order, dist, parent=None):
+    """Creates a NodeList from the result of bfs_layers or bfs_tree
+
+    Args:
+        graph (CSRGraph): graph that was searched
+        order (ndarray): ids of reached nodes
+        dist (ndarray): distance of each reached node from the root
+        parent (ndarray): id of each node's BFS-tree parent from bfs_tree,
+            kept as positions in the list when given
+
+    Returns:
+        node_list: NodeList in the order the nodes were reached
+    """
+    names = graph.nodes
+    parents = None
+    if parent is not None:
+        sorter = np.argsort(order)
+        parents = np.where(parent < 0, -1,
+                           sorter[np.searchsorted(order, parent, sorter=sorter)])
+    return NodeList([names[i] for i in order.tolist()], dist, ids=order, parents=parents)
+
+
+def layer_crd(dist, measures):
+    """Sum measures per BFS layer and accumulate them over the radius
+
+    Args:
+        dist (ndarray): distance of each reached node from the root
+        measures: measure of each reached node, same order as dist
+
+    Returns:
+        ndarray: the cumulative radial distribution
+    """
+    return np.cumsum(np.bincount(dist, weights=np.asarray(measures, dtype=float)))
+
+
+def node_crd(graph, u, measure, radius):
+    """Calculate the Cumulative Radial Distribution of a node
+
+    Args:
+        graph (CSRGraph): graph holding u
+        u: label of the root node
+        measure: a function from rdd.measures
+        radius: the maximum radius to consider
+
+    Returns:
+        ndarray: the cumulative radial distribution of u
+    """
+    order, dist, parent = bfs_tree(graph, graph.node_id(u), radius)
+    node_list = layers_to_node_list(graph, order, dist, parent)
+    return layer_crd(dist, measure(graph.network, node_list))
+
+
+def node_crds(graph, u, measures, radius):
+    """Calculate the CRD of a node for several measures from one BFS
+
+    Every measure is evaluated on the same node list, so the ball around u
+    is searched once however many measures are given.
+
+    Args:
+        graph (CSRGraph): graph holding u
+        u: label of the root node
+        measures: list of functions from rdd.measures
+        radius: the maximum radius to consider
+
+    Returns:
+        ndarray: len(measures) x R array, row i is the CRD of u for measures[i]
+    """
+    order, dist, parent = bfs_tree(graph, graph.node_id(u), radius)
+    node_list = layers_to_node_list(graph, order, dist, parent)
+    return np.array([layer_crd(dist, m(graph.network, node_list)) for m in measures])
+
+
+def node_crd_by_radius(graph, u, measure, radius):
+    """Calculate the CRD of a node for every radius 1..radius from one BFS
+
+    The ball of radius r is the prefix of the radius BFS order up to the
+    last node r hops away. A global measure gives each node the same value
+    in every ball, so its CRDs are the prefixes of one CRD. Local measures
+    are evaluated again on each smaller ball.
+
+    Args:
+        graph (CSRGraph): graph holding u
+        u: label of the root node
+        measure: a function from rdd.measures
+        radius (int): the largest radius to consider
+
+    Returns:
+        list: entry r - 1 is the CRD of u at radius r, same as node_crd
+    """
+    order, dist, parent = bfs_tree(graph, graph.node_id(u), radius)
+    if is_global_measure(measure):
+        crd = layer_crd(dist, measure(graph.network, layers_to_node_list(graph, order, dist)))
+        return [crd[:r + 1] for r in range(1, radius + 1)]
+    rows = []
+    for r in range(1, radius + 1):
+        k = np.searchsorted(dist, r, side='right')
+        node_list = layers_to_node_list(graph, order[:k], dist[:k], parent[:k])
+        rows.append(layer_crd(dist[:k], measure(graph.network, node_list)))
+    return rows
+
+
+def pad_crd(crd, length):
+    """Extend a CRD to length by repeating its last value"""
+    if len(crd) >= length:
+        return crd
+    return np.concatenate((crd, np.full(length - len(crd), crd[-1])))
+
+
+def crd_distance(crd1, crd2, kernel=None):
+    """Get the radial distribution distance for two CRD arrays
+
+    Same value as rdd.RDD.get_rdd after rdd.RDD.ensure_radial_parity.
+    kernel picks the radius weights, see radius_weights.
+    """
+    length = max(len(crd1), len(crd2))
+    diff = np.abs(pad_crd(crd1, length) - pad_crd(crd2, length))
+    return float(np.sum(radius_weights(length, kernel) * diff))
+
+
+def crd_distances(crds1, crds2, kernel=None):
+    """Get the radial distribution distance row by row for two stacks of CRDs
+
+    Args:
+        crds1, crds2: arrays as returned by node_crds, one row per measure
+        kernel: radius weights, see radius_weights
+
+    Returns:
+        ndarray: crd_distance of each pair of rows
+    """
+    length = max(crds1.shape[1], crds2.shape[1])
+    diff = np.abs(pad_crd_rows(crds1, length) - pad_crd_rows(crds2, length))
+    return np.sum(radius_weights(length, kernel) * diff, axis=1)
+
+
+def csr_realworld_distance_compare(graph, u, v, measure, radius, graph2=None, kernel=None):
+    """CSR version of rdd.RDD.realworld_distance_compare
+
+    Args:
+        graph: a CSRGraph, or a networkx Graph (converted once, see rdd.csr.to_csr)
+        u: label of the first node
+        v: label of the second node
+        measure: a function that returns a list of values representing measures for each node
+        radius: the maximum radius we want to compare with
+        graph2: Used if node v is from a different graph
+        kernel: radius weights, see radius_weights
+
+    Returns:
+        radial distribution distance value of u compared to v
+    """
+    graph = to_csr(graph)
+    graph2 = graph if graph2 is None else to_csr(graph2)
+
+    crd1 = node_crd(graph, u, measure, radius)
+    crd2 = node_crd(graph2, v, measure, radius)
+    return crd_distance(crd1, crd2, kernel)
+
+
+def measure_name(measure):
+    """Get the name of a measure, looking through functools.partial wrappers
+
+    Returns:
+        str: the function's __name__, '' for callables without one
+    """
+    while isinstance(measure, functools.partial):
+        measure = measure.func
+    return getattr(measure, '__name__', '')
+
+
+def is_global_measure(measure):
+    """True for measures whose value for a node does not depend on the ball around the root
+
+    The global_graph_* measures in rdd.measures look every node up in the
+    whole graph, so their values can be taken one BFS layer at a time. A
+    measure can say so explicitly with an is_global attribute; otherwise
+    the name decides, and measures without a recognizable name are treated
+    as local, which is always correct, just slower.
+    """
+    flag = getattr(measure, 'is_global', None)
+    if flag is not None:
+        return bool(flag)
+    return measure_name(measure).startswith('global_')
+
+
+def global_measure_values(graph, measure):
+    """Get a global measure for every node of graph, cached per graph
+
+    Args:
+        graph (CSRGraph): graph to measure
+        measure: a global function from rdd.measures, see is_global_measure
+
+    Returns:
+        ndarray: value of each node, indexed by integer id
+    """
+    def compute():
+        ids = np.arange(len(graph))
+        node_list = layers_to_node_list(graph, ids, np.zeros(len(graph), dtype=np.int64))
+        return np.asarray(measure(graph.network, node_list), dtype=float)
+    return cached(graph.network, ('measure_values', measure), compute)
+
+
+def crd_matrix(graph, measure, radius, nodes=None):
+    """Build the CRD of every node once, one row per node
+
+    Args:
+        graph (CSRGraph): graph holding the nodes
+        measure: a function from rdd.measures
+        radius: the maximum radius to consider
+        nodes: node labels to use as roots, defaults to every node of graph
+
+    Returns:
+        tuple: (crds, layers) where crds is a len(nodes) x R array of CRDs
+        padded with their last value and layers holds the unpadded length
+        of each row
+    """
+    if nodes is None:
+        nodes = graph.nodes
+    rows = [node_crd(graph, u, measure, radius) for u in nodes]
+    layers = np.array([len(row) for row in rows], dtype=np.int64)
+    width = int(layers.max()) if len(rows) else 0
+    crds = np.empty((len(rows), width))
+    for i, row in enumerate(rows):
+        crds[i] = pad_crd(row, width)
+    return crds, layers
+
+
+def crd_matrices_by_radius(graph, measure, radius, nodes=None):
+    """Build crd_matrix for every radius 1..radius with one BFS per node
+
+    Returns:
+        list: entry r - 1 is the (crds, layers) pair of crd_matrix at radius r
+    """
+    if nodes is None:
+        nodes = graph.nodes
+    per_node = [node_crd_by_radius(graph, u, measure, radius) for u in nodes]
+    matrices = []
+    for r in range(radius):
+        rows = [by_radius[r] for by_radius in per_node]
+        layers = np.array([len(row) for row in rows], dtype=np.int64)
+        width = int(layers.max()) if len(rows) else 0
+        crds = np.empty((len(rows), width))
+        for i, row in enumerate(rows):
+            crds[i] = pad_crd(row, width)
+        matrices.append((crds, layers))
+    return matrices
+
+
+def pairwise_rdd(crds, layers, crds2=None, layers2=None, block_size=64, kernel=None):
+    """Get the RDD between every row of one CRD matrix and every row of another
+
+    Rows are compared up to the longer of their two unpadded lengths, the
+    same as rdd.RDD.ensure_radial_parity does for a single pair. The work
+    is broadcast over blocks of block_size rows to bound memory.
+
+    Args:
+        crds, layers: a CRD matrix as returned by crd_matrix
+        crds2, layers2: the matrix to compare against, defaults to the first
+        block_size (int): number of rows of crds handled per broadcast
+        kernel: radius weights, see radius_weights
+
+    Returns:
+        ndarray: out[i, j] is the RDD between row i of crds and row j of crds2
+    """
+    if crds2 is None:
+        crds2, layers2 = crds, layers
+    width = max(crds.shape[1], crds2.shape[1])
+    crds = pad_crd_rows(crds, width)
+    crds2 = pad_crd_rows(crds2, width)
+    weights = radius_weights(width, kernel)
+    radii = np.arange(width)
+
+    out = np.empty((len(crds), len(crds2)))
+    for start in range(0, len(crds), block_size):
+        stop = start + block_size
+        diff = np.abs(crds[start:stop, None, :] - crds2[None, :, :])
+        longest = np.maximum(layers[start:stop, None], layers2[None, :])
+        block_weights = np.where(radii < longest[:, :, None], weights, 0.0)
+        out[start:stop] = np.sum(diff * block_weights, axis=2)
+    return out
+
+
+def sparse_pairwise_rdd(crds, layers, crds2=None, layers2=None, threshold=None, k=None,
+                        block_size=64, kernel=None):
+    """Get only the small entries of pairwise_rdd, without a dense n x n matrix
+
+    Rows are handled block_size at a time. With a threshold the RDD sum is
+    built one radius at a time and a pair is dropped as soon as its partial
+    sum passes the threshold, since later terms only add to it.
+
+    Args:
+        crds, layers: a CRD matrix as returned by crd_matrix
+        crds2, layers2: the matrix to compare against, defaults to the first
+        threshold (float): keep pairs whose RDD is at most threshold
+        k (int): keep the k smallest RDDs of each row, ties broken by column
+        block_size (int): number of rows of crds handled at once
+        kernel: radius weights, see radius_weights
+
+    Returns:
+        tuple: (rows, cols, values) arrays of the kept entries
+    """
+    if crds2 is None:
+        crds2, layers2 = crds, layers
+    width = max(crds.shape[1], crds2.shape[1])
+    crds = pad_crd_rows(crds, width)
+    crds2 = pad_crd_rows(crds2, width)
+    weights = radius_weights(width, kernel)
+
+    rows, cols, values = [], [], []
+    for start in range(0, len(crds), block_size):
+        stop = start + block_size
+        block, block_layers = crds[start:stop], layers[start:stop]
+        if threshold is None:
+            dist = pairwise_rdd(block, block_layers, crds2, layers2, block_size, kernel)
+            keep = np.ones(dist.shape, dtype=bool)
+        else:
+            longest = np.maximum(block_layers[:, None], layers2[None, :])
+            dist = np.zeros((len(block), len(crds2)))
+            keep = np.ones(dist.shape, dtype=bool)
+            for r in range(width):
+                i, j = np.nonzero(keep & (r < longest))
+                if i.size == 0:
+                    break
+                dist[i, j] += weights[r] * np.abs(block[i, r] - crds2[j, r])
+                keep[i, j] = dist[i, j] <= threshold
+        if k is None:
+            i, j = np.nonzero(keep)
+        else:
+            ranked = np.argsort(np.where(keep, dist, np.inf), axis=1, kind='stable')[:, :k]
+            i = np.repeat(np.arange(len(block)), ranked.shape[1])
+            j = ranked.ravel()
+            found = keep[i, j]
+            i, j = i[found], j[found]
+        rows.append(i + start)
+        cols.append(j)
+        values.append(dist[i, j])
+
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+
+
+def pad_crd_rows(crds, width):
+    """Pad every row of a CRD matrix to width columns with its last value"""
+    if crds.shape[1] >= width:
+        return crds
+    pad = np.repeat(crds[:, -1:], width - crds.shape[1], axis=1)
+    return np.hstack((crds, pad))
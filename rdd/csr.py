@@ -0,0 +1,190 @@
+"""Compressed sparse row graphs.
+
+This module converts a NetworkX graph into a compressed sparse row (CSR)
+adjacency with integer node ids so that breadth-first searches can be
+run on NumPy arrays instead of Python dictionaries.
+"""
+import networkx as nx
+import numpy as np
+from rdd.cache import cached
+
+
+class CSRGraph:
+    """Integer-indexed CSR copy of a NetworkX graph
+
+    Attributes:
+    ---------
+        network: the NetworkX graph the arrays were built from
+        nodes: list of node labels, position i holds the label of id i
+        index: dictionary node label -> integer id
+        indptr: neighbors of id i are indices[indptr[i]:indptr[i + 1]]
+        indices: concatenated neighbor ids, in NetworkX adjacency order
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self.nodes = list(network)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+
+        adj = network.adj
+        degrees = np.fromiter((len(adj[node]) for node in self.nodes),
+                              dtype=np.int64, count=len(self.nodes))
+        self.indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=self.indptr[1:])
+        self.indices = np.fromiter(
+            (self.index[nbr] for node in self.nodes for nbr in adj[node]),
+            dtype=np.int64, count=int(self.indptr[-1]))
+
+    @classmethod
+    def from_arrays(cls, indptr, indices, network=None):
+        """Wrap existing CSR arrays, e.g. views of shared memory
+
+        Args:
+            indptr, indices: arrays laid out like those of a CSRGraph
+            network: the NetworkX graph they were built from, in the same
+                node order; without it the labels are the integer ids
+
+        Returns:
+            CSRGraph: a graph reading the given arrays without copying them
+        """
+        graph = cls.__new__(cls)
+        graph.network = network
+        graph.nodes = list(range(len(indptr) - 1)) if network is None else list(network)
+        graph.index = {node: i for i, node in enumerate(graph.nodes)}
+        graph.indptr = indptr
+        graph.indices = indices
+        return graph
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f"CSRGraph with {len(self.nodes)} nodes and {len(self.indices)} arcs"
+
+    def node_id(self, node):
+        """Get the integer id of a node label"""
+        try:
+            return self.index[node]
+        except KeyError:
+            raise nx.NodeNotFound(f"Source {node} is not in G") from None
+
+
+def to_csr(network):
+    """Get the CSRGraph of network, converting it once per graph version"""
+    if isinstance(network, CSRGraph):
+        return network
+    return cached(network, 'csr', lambda: CSRGraph(network))
+
+
+def neighbors_of(graph, frontier):
+    """Concatenate the neighbor ids of every id in frontier, in order.
+
+    Args:
+        graph (CSRGraph): graph to read
+        frontier (ndarray): integer ids
+
+    Returns:
+        ndarray: neighbor ids of frontier[0], then of frontier[1], etc.
+    """
+    starts = graph.indptr[frontier]
+    counts = graph.indptr[frontier + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return graph.indices[offsets + np.arange(offsets.size)]
+
+
+def _sources(source):
+    """Get the distinct source ids of a search, in the order given"""
+    frontier = np.array(source, dtype=np.int64, ndmin=1)
+    _, first = np.unique(frontier, return_index=True)
+    return frontier[np.sort(first)]
+
+
+def next_layer(graph, frontier, seen):
+    """Expand a BFS frontier by one hop.
+
+    Args:
+        graph (CSRGraph): graph to search
+        frontier (ndarray): ids of the current layer
+        seen (ndarray): boolean mask of reached ids, updated in place
+
+    Returns:
+        tuple: (layer, parents), the newly reached ids in discovery order
+        and the id of the frontier node that reached each of them first
+    """
+    candidates = neighbors_of(graph, frontier)
+    owners = np.repeat(frontier, graph.indptr[frontier + 1] - graph.indptr[frontier])
+    unseen = ~seen[candidates]
+    candidates, owners = candidates[unseen], owners[unseen]
+    # keep the first time each node is reached, in discovery order
+    _, first = np.unique(candidates, return_index=True)
+    first.sort()
+    seen[candidates[first]] = True
+    return candidates[first], owners[first]
+
+
+def bfs_tree(graph, source, radius=None):
+    """Breadth-first search from source up to radius hops.
+
+    Only hop counts and BFS-tree parents are recorded, no path lists. Nodes
+    are reported in the same order nx.single_source_shortest_path discovers
+    them and each parent is the node that discovered it first, so the tree
+    matches the one rdd.RDD.paths_to_graph builds from those paths.
+
+    Args:
+        graph (CSRGraph): graph to search
+        source (int): integer id of the root, or a sequence of ids to
+            search from all of them at once
+        radius (int): maximum depth, None searches the whole component
+
+    Returns:
+        tuple: (order, dist, parent) where order holds the ids of reached
+        nodes, dist their distance from source and parent the id of their
+        BFS-tree parent (-1 for source)
+    """
+    frontier = _sources(source)
+    seen = np.zeros(len(graph), dtype=bool)
+    seen[frontier] = True
+    layers = [frontier]
+    parents = [np.full(len(frontier), -1, dtype=np.int64)]
+    while radius is None or len(layers) <= radius:
+        frontier, owners = next_layer(graph, frontier, seen)
+        if frontier.size == 0:
+            break
+        layers.append(frontier)
+        parents.append(owners)
+
+    order = np.concatenate(layers)
+    dist = np.repeat(np.arange(len(layers)), [len(layer) for layer in layers])
+    return order, dist, np.concatenate(parents)
+
+
+def bfs_layers(graph, source, radius=None):
+    """Same as bfs_tree without the parents, returns (order, dist)"""
+    order, dist, _ = bfs_tree(graph, source, radius)
+    return order, dist
+
+
+def iter_bfs_layers(graph, source, radius=None):
+    """Yield the BFS layers of source one at a time, starting with the source.
+
+    Nothing beyond the last layer consumed is searched, so callers can stop
+    early.
+
+    Args:
+        graph (CSRGraph): graph to search
+        source (int): integer id of the root, or a sequence of ids
+        radius (int): maximum depth, None searches the whole component
+
+    Yields:
+        ndarray: ids of the nodes at distance 0, 1, 2, ... in discovery order
+    """
+    frontier = _sources(source)
+    seen = np.zeros(len(graph), dtype=bool)
+    seen[frontier] = True
+    depth = 0
+    while frontier.size:
+        yield frontier
+        if radius is not None and depth >= radius:
+            return
+        frontier, _ = next_layer(graph, frontier, seen)
+        depth += 1
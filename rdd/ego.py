@@ -0,0 +1,138 @@
+"""Ego subgraph cache.
+
+The local_graph_* measures and the *_radius helpers all work on the
+subgraph induced by the radius-r ball around a root, and a matrix job asks
+for the same balls over and over. This module keeps a bounded LRU of those
+subgraphs, plus any results computed on them, per graph. The LRU lives in
+the graph's rdd.cache entry, so the key is effectively (graph version,
+root, radius) and every entry is dropped when the graph changes.
+
+Cached subgraphs are compact frozen copies rather than views, so repeated
+measures on them do not pay for filtering the parent graph's adjacency.
+"""
+from collections import OrderedDict
+import networkx as nx
+import numpy as np
+from rdd.Node import NodeList
+from rdd.cache import cached
+from rdd.csr import bfs_layers, to_csr
+
+
+# most ego subgraphs kept per graph
+EGO_CACHE_SIZE = 256
+
+
+def _ego_lru(network):
+    return cached(network, 'ego_graphs', OrderedDict)
+
+
+def _entry(network, root, radius):
+    lru = _ego_lru(network)
+    key = (root, radius)
+    entry = lru.get(key)
+    if entry is not None:
+        lru.move_to_end(key)
+        return entry
+    graph = to_csr(network)
+    order, _ = bfs_layers(graph, graph.node_id(root), radius)
+    names = [graph.nodes[i] for i in order.tolist()]
+    entry = (nx.freeze(network.subgraph(names).copy()), {})
+    lru[key] = entry
+    while len(lru) > EGO_CACHE_SIZE:
+        lru.popitem(last=False)
+    return entry
+
+
+def ego_graph(network, root, radius):
+    """Get the subgraph induced by every node within radius of root
+
+    Args:
+        network: a networkx Graph object
+        root: center node
+        radius: the maximum radius, None for the whole component
+
+    Returns:
+        a frozen nx.Graph() shared with other callers, copy it before editing
+    """
+    return _entry(network, root, radius)[0]
+
+
+def ego_result(network, root, radius, key, compute):
+    """Get a value computed on ego_graph(network, root, radius), cached with it
+
+    Args:
+        network: a networkx Graph object
+        root: center node
+        radius: the maximum radius
+        key: hashable name of the value, e.g. 'pagerank'
+        compute: function ego graph -> value
+
+    Returns:
+        the cached value
+    """
+    graph, results = _entry(network, root, radius)
+    if key not in results:
+        results[key] = compute(graph)
+    return results[key]
+
+
+def node_list_ego(network, node_list):
+    """Get the ego graph and results dictionary spanned by a node list
+
+    A node list from a BFS holds the whole ball around its root, the node
+    at radius 0, up to its largest radius, so it maps to one cache entry.
+    Lists that are not such a ball are smaller than it and get an uncached
+    subgraph instead.
+
+    Args:
+        network: a networkx Graph object
+        node_list: NodeList or list of Node objects
+
+    Returns:
+        tuple: (graph, results), results is a dict to cache per-measure values in
+    """
+    if isinstance(node_list, NodeList):
+        names, radii = node_list.names, node_list.radii
+    else:
+        names = [node.name for node in node_list]
+        radii = np.array([node.radius for node in node_list], dtype=np.int64)
+    if len(names) == 0:
+        return network.subgraph(names), {}
+    root, radius = names[int(np.argmin(radii))], int(radii.max())
+    graph, results = _entry(network, root, radius)
+    if graph.number_of_nodes() != len(names):
+        return network.subgraph(names), {}
+    return graph, results
+
+
+def ego_measure(network, node_list, key, compute):
+    """Get compute(ego graph) for the ball of node_list, cached per ball
+
+    Args:
+        network: a networkx Graph object
+        node_list: NodeList or list of Node objects
+        key: hashable name of the value
+        compute: function ego graph -> value
+
+    Returns:
+        the value of compute on the ball's subgraph
+    """
+    graph, results = node_list_ego(network, node_list)
+    if key not in results:
+        results[key] = compute(graph)
+    return results[key]
+
+
+def ball_ids(network, node_list):
+    """Get the CSR ids of the nodes of node_list, in order"""
+    index = to_csr(network).index
+    if isinstance(node_list, NodeList):
+        names = node_list.names
+    else:
+        names = [node.name for node in node_list]
+    return np.array([index[name] for name in names], dtype=np.int64)
+
+
+def clear_ego_cache(network):
+    """Drop every cached ego graph of network"""
+    _ego_lru(network).clear()
@@ -0,0 +1,136 @@
+"""Harmonic centrality by batched breadth-first search.
+
+nx.harmonic_centrality runs a Python BFS from every node. Here many BFS
+run at once: the frontiers of a batch of sources are the columns of a
+dense (n, batch) array and one sparse product with the transposed
+adjacency advances all of them by a hop. A node first reached at hop k
+from some sources gains 1 / k for each of them. This is exact and suits
+ego graphs, which are small enough for a frontier column per source. On
+large graphs the batch shrinks so the frontier arrays stay within
+FRONTIER_BYTES.
+
+For large graphs, approx_harmonic_centrality runs the search from a
+random sample of pivots only and scales the sums up by n / samples, an
+unbiased estimate of the full sums.
+"""
+import numpy as np
+from rdd.cache import cached
+from rdd.csr import to_csr
+from rdd.ego_triangles import adjacency_matrix
+
+
+# memory allowed for the frontier arrays of one batch
+FRONTIER_BYTES = 1 << 26
+# bytes per node and source: reached and new (bool), frontier and its
+# product with the adjacency (float32)
+_ENTRY_BYTES = 10
+
+
+def graph_adjacency(network):
+    """Get the 0/1 CSR adjacency of network without self loops, cached per graph"""
+    return cached(network, 'adjacency', lambda: adjacency_matrix(to_csr(network)))
+
+
+def frontier_batch(n, batch_size):
+    """Get how many sources to search together on n nodes, at most batch_size"""
+    return max(1, min(batch_size, FRONTIER_BYTES // (_ENTRY_BYTES * max(n, 1))))
+
+
+def bfs_harmonic(adj, sources=None, batch_size=256):
+    """Sum 1 / distance from the sources to every node
+
+    Args:
+        adj: sparse adjacency matrix, adj[u, v] != 0 for an edge u -> v
+        sources (ndarray): row ids to search from, defaults to every node
+        batch_size (int): most sources searched together, see frontier_batch
+
+    Returns:
+        ndarray: for every node, the sum of 1 / d(s, v) over the sources s
+        that reach it, s != v; the harmonic centrality when sources are all
+        nodes
+    """
+    n = adj.shape[0]
+    step = adj.T.tocsr().astype(np.float32)
+    sources = np.arange(n) if sources is None else np.asarray(sources, dtype=np.int64)
+    centrality = np.zeros(n)
+    batch_size = frontier_batch(n, batch_size)
+    for start in range(0, len(sources), batch_size):
+        batch = sources[start:start + batch_size]
+        reached = np.zeros((n, len(batch)), dtype=bool)
+        reached[batch, np.arange(len(batch))] = True
+        frontier = reached.astype(np.float32)
+        hop = 1
+        while True:
+            new = (step @ frontier > 0) & ~reached
+            counts = new.sum(axis=1)
+            if not counts.any():
+                break
+            centrality += counts / hop
+            reached |= new
+            frontier = new.astype(np.float32)
+            hop += 1
+    return centrality
+
+
+def harmonic_centrality(network, batch_size=256):
+    """Harmonic centrality of every node, as nx.harmonic_centrality
+
+    Returns:
+        dict: node -> centrality
+    """
+    values = bfs_harmonic(graph_adjacency(network), batch_size=batch_size)
+    return dict(zip(to_csr(network).nodes, values.tolist()))
+
+
+def subgraph_harmonic(network, ids, batch_size=256):
+    """Harmonic centrality inside the subgraph induced by CSR ids
+
+    Returns:
+        ndarray: centrality of each of ids
+    """
+    return bfs_harmonic(graph_adjacency(network)[ids][:, ids], batch_size=batch_size)
+
+
+def approx_harmonic_centrality(network, samples=256, seed=None, batch_size=256):
+    """Estimate harmonic centrality from BFS out of sampled pivots
+
+    Args:
+        network: a networkx Graph object
+        samples (int): number of pivots, all nodes (exact) when at least n
+        seed: seed for numpy.random.default_rng
+        batch_size (int): most pivots searched together, see frontier_batch
+
+    Returns:
+        dict: node -> estimated centrality
+    """
+    graph = to_csr(network)
+    n = len(graph)
+    if samples >= n:
+        return harmonic_centrality(network, batch_size)
+    pivots = np.sort(np.random.default_rng(seed).choice(n, samples, replace=False))
+    values = bfs_harmonic(graph_adjacency(network), pivots, batch_size) * (n / samples)
+    return dict(zip(graph.nodes, values.tolist()))
+
+
+def harmonic_measure(samples=256, seed=None):
+    """Build a global_graph_harmonic_centrality measure on sampled pivots
+
+    The estimate is computed once per graph and cached, so every node list
+    of the graph sees the same sample.
+
+    Args:
+        samples (int): number of pivots
+        seed: seed for numpy.random.default_rng
+
+    Returns:
+        function: a measure function named global_graph_harmonic_centrality
+    """
+    from rdd.RDD import node_names
+
+    def measure(network, node_list):
+        values = cached(network, ('approx_harmonic_centrality', samples, seed),
+                        lambda: approx_harmonic_centrality(network, samples, seed))
+        return [values[name] for name in node_names(node_list)]
+
+    measure.__name__ = 'global_graph_harmonic_centrality'
+    return measure
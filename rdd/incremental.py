@@ -0,0 +1,157 @@
+"""Incremental RDD maintenance.
+
+This module keeps the CRD of every node and the full RDD matrix of a graph
+up to date while edges are inserted and deleted. After an edge change only
+nodes whose radius-R ball can see it need a new CRD, so only those rows and
+columns of the matrix are recomputed.
+
+An edge (a, b) can change the CRD of u when a or b lies within R hops of u,
+plus however far the measure itself spreads a change: a node's global
+degree only moves when one of its own edges does, its global triangle
+count when an edge between two of its neighbors does, and PageRank or
+Katz values move everywhere. MEASURE_REACH records that extra distance
+for the measures in rdd.measures.
+"""
+import functools
+from itertools import chain
+import numpy as np
+from rdd.crd import (crd_matrix, is_global_measure, measure_name, pad_crd, node_crd,
+                     pairwise_rdd, pad_crd_rows)
+from rdd.csr import bfs_layers, to_csr
+
+
+# hops beyond the radius at which an edge change can alter a measure value,
+# None when it can alter values anywhere in the graph; the local_* measures
+# only look inside the ball so they need no extra hops
+MEASURE_REACH = {
+    'global_graph_degree': 0,
+    'global_graph_triangles': 1,
+    'global_graph_clique': 1,
+    'global_graph_morgan_index': 6,  # walks of 7 steps with the default 8 iterations
+    'global_graph_katz_centrality': None,
+    'global_graph_harmonic_centrality': None,
+    'global_graph_pagerank': None,
+}
+
+
+def measure_reach(measure):
+    """Get the MEASURE_REACH entry of a measure, None for unknown global measures
+
+    Local measures reach nothing beyond the ball. The table only describes
+    the measures with their default arguments, so a functools.partial that
+    binds arguments of a global measure counts as unknown.
+    """
+    if not is_global_measure(measure):
+        return 0 if measure_name(measure).startswith('local_') else None
+    bound = isinstance(measure, functools.partial) and (measure.args or measure.keywords)
+    if bound:
+        return None
+    return MEASURE_REACH.get(measure_name(measure))
+
+
+def edge_diff(G_old, G_new):
+    """Get the edges to add and remove to turn G_old into G_new
+
+    Returns:
+        tuple: (added, removed) lists of edges
+    """
+    added = [e for e in G_new.edges() if not G_old.has_edge(*e)]
+    removed = [e for e in G_old.edges() if not G_new.has_edge(*e)]
+    return added, removed
+
+
+class IncrementalRDD:
+    """CRDs and RDD matrix of a graph, patched on every edge update
+
+    Attributes:
+    ---------
+        network: the graph, mutated in place by update
+        nodes: node labels, position i is row and column i
+        crds, layers: CRD matrix as returned by rdd.crd.crd_matrix
+        rdd: rdd[i, j] is the RDD between nodes[i] and nodes[j]
+        kernel: radius weights of rdd
+    """
+
+    def __init__(self, G, measure, radius, reach='auto', kernel=None):
+        """Compute every CRD and the full RDD matrix of G.
+
+        Args:
+            G (Graph): NetworkX Graph, later changed through update
+            measure (function): A measure function
+            radius (int): radius
+            reach: hops beyond radius at which an edge change can alter
+                measure values, None for anywhere, 'auto' to look the
+                measure up with measure_reach
+            kernel: radius weights from rdd.kernels, None for exp(-r)
+        """
+        self.network = G
+        self.measure = measure
+        self.radius = radius
+        self.reach = measure_reach(measure) if reach == 'auto' else reach
+        self.kernel = kernel
+        graph = to_csr(G)
+        self.nodes = list(graph.nodes)
+        self.crds, self.layers = crd_matrix(graph, measure, radius)
+        self.rdd = pairwise_rdd(self.crds, self.layers, kernel=kernel)
+
+    def update(self, added=(), removed=()):
+        """Apply an edge diff to the graph and patch the stored values.
+
+        Args:
+            added: edges to insert, their endpoints are added as new nodes
+                if they are not in the graph yet
+            removed: edges to delete
+
+        Returns:
+            list: the nodes whose CRD was recomputed
+        """
+        added, removed = list(added), list(removed)
+        # with the insertions applied and the deletions not yet, the graph
+        # holds every edge of both versions, so its distances are the
+        # shortest either version can have
+        self.network.add_edges_from(added)
+        affected = self._affected(chain(added, removed))
+        self.network.remove_edges_from(removed)
+
+        graph = to_csr(self.network)
+        self._grow(graph.nodes)
+        rows = [node_crd(graph, graph.nodes[i], self.measure, self.radius) for i in affected]
+        width = max([self.crds.shape[1]] + [len(row) for row in rows])
+        self.crds = pad_crd_rows(self.crds, width)
+        for i, row in zip(affected, rows):
+            self.crds[i] = pad_crd(row, width)
+            self.layers[i] = len(row)
+
+        if len(affected):
+            patch = pairwise_rdd(self.crds[affected], self.layers[affected],
+                                 self.crds, self.layers, kernel=self.kernel)
+            self.rdd[affected, :] = patch
+            self.rdd[:, affected] = patch.T
+        return [self.nodes[i] for i in affected]
+
+    def _affected(self, edges):
+        """Get the sorted row ids of nodes whose CRD an edge change can reach"""
+        network = self.network
+        if network.is_directed():
+            network = network.to_undirected(as_view=True)
+        graph = to_csr(network)
+        if self.reach is None:
+            return np.arange(len(graph))
+        endpoints = [graph.index[x] for x in dict.fromkeys(chain.from_iterable(
+            e[:2] for e in edges)) if x in graph.index]
+        if not endpoints:
+            return np.array([], dtype=np.int64)
+        depth = None if self.radius is None else self.radius + self.reach
+        order, _ = bfs_layers(graph, endpoints, depth)
+        return np.sort(order)
+
+    def _grow(self, nodes):
+        """Append rows and columns for nodes that joined the graph"""
+        extra = len(nodes) - len(self.nodes)
+        if extra <= 0:
+            return
+        self.nodes = list(nodes)
+        width = self.crds.shape[1]
+        self.crds = np.vstack((self.crds, np.zeros((extra, width))))
+        self.layers = np.concatenate((self.layers, np.ones(extra, dtype=np.int64)))
+        self.rdd = np.pad(self.rdd, ((0, extra), (0, extra)))
@@ -0,0 +1,163 @@
+"""Metric index for RDD queries.
+
+This module builds a vantage-point tree over the CRD of every node so
+that "which nodes are closest to u" can be answered without comparing u
+against the whole graph. Subtrees are pruned with the triangle inequality.
+
+The index compares CRDs padded to the same depth, which makes the
+distance a true weighted L1 metric. It equals rdd.RDD.realworld_distance_compare
+whenever at least one of the two balls reaches that depth, which is
+always the case in a connected graph whose radius-R balls all reach R
+hops. Otherwise the padded value adds the exp(-r) weighted gap between
+the two final CRD values for the extra radii.
+"""
+import heapq
+import numpy as np
+from rdd.crd import crd_matrix, radius_weights
+from rdd.csr import to_csr
+
+
+class RDDIndex:
+    """Vantage-point tree over per-node CRD vectors
+
+    Attributes:
+    ---------
+        nodes: node labels, position i is row i of crds
+        index: dictionary node label -> row
+        crds: CRD matrix, one padded row per node
+        weights: radius weight of each column
+    """
+
+    def __init__(self, G, measure, radius, leaf_size=16, seed=0, kernel=None):
+        """Build the index.
+
+        Args:
+            G (Graph): NetworkX Graph
+            measure (function): A measure function
+            radius (int): the maximum radius used for the CRDs
+            leaf_size (int): largest bucket scanned linearly
+            seed (int): seed for picking vantage points
+            kernel: radius weights from rdd.kernels, None for exp(-r)
+        """
+        graph = to_csr(G)
+        self.nodes = graph.nodes
+        self.index = graph.index
+        self.crds, _ = crd_matrix(graph, measure, radius)
+        self.weights = radius_weights(self.crds.shape[1], kernel)
+        self.leaf_size = leaf_size
+        self._build(np.random.default_rng(seed))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def distances(self, row, ids):
+        """Get the padded RDD between a CRD row and the rows ids"""
+        return np.sum(np.abs(self.crds[ids] - row) * self.weights, axis=1)
+
+    def _build(self, rng):
+        # tree stored as parallel lists: vantage point, median radius,
+        # inner child, outer child; leaves have vp -1 and a bucket of ids
+        self._vp, self._mu, self._inner, self._outer, self._bucket = [], [], [], [], []
+        stack = [(self._new_node(), np.arange(len(self.nodes)))]
+        while stack:
+            node, ids = stack.pop()
+            if len(ids) <= self.leaf_size:
+                self._bucket[node] = ids
+                continue
+            pick = rng.integers(len(ids))
+            vp, rest = ids[pick], np.delete(ids, pick)
+            d = self.distances(self.crds[vp], rest)
+            mu = float(np.median(d))
+            inside = d <= mu
+            if inside.all():
+                inside = d < mu
+            if not inside.any():
+                # every remaining row is the same distance from vp
+                self._bucket[node] = ids
+                continue
+            self._vp[node], self._mu[node] = int(vp), mu
+            self._inner[node], self._outer[node] = self._new_node(), self._new_node()
+            stack.append((self._inner[node], rest[inside]))
+            stack.append((self._outer[node], rest[~inside]))
+
+    def _new_node(self):
+        for column in (self._vp, self._inner, self._outer):
+            column.append(-1)
+        self._mu.append(0.0)
+        self._bucket.append(None)
+        return len(self._vp) - 1
+
+    def _search(self, row, visit, bound):
+        """Walk the tree, calling visit(ids, dists) on every candidate
+
+        bound() gives the current search radius. Subtrees whose lower bound
+        from the triangle inequality is beyond it are skipped.
+        """
+        stack = [(0, 0.0)]
+        while stack:
+            node, lower = stack.pop()
+            # slack keeps rounding from pruning nodes exactly on the boundary
+            if lower > bound() * (1 + 1e-9) + 1e-12:
+                continue
+            bucket = self._bucket[node]
+            if bucket is not None:
+                visit(bucket, self.distances(row, bucket))
+                continue
+            vp, mu = self._vp[node], self._mu[node]
+            d = float(self.distances(row, [vp])[0])
+            visit(np.array([vp]), np.array([d]))
+            # inner rows are within mu of vp, outer rows at least mu away
+            if d <= mu:
+                stack.append((self._outer[node], mu - d))
+                stack.append((self._inner[node], 0.0))
+            else:
+                stack.append((self._inner[node], d - mu))
+                stack.append((self._outer[node], 0.0))
+
+    def knn(self, u, k):
+        """Get the k nodes with the smallest RDD to u, u itself included
+
+        Args:
+            u: node label
+            k (int): number of neighbors
+
+        Returns:
+            list: (node, rdd) tuples sorted by rdd, ties broken by node order
+        """
+        row = self.crds[self.index[u]]
+        heap = []   # max-heap of (-rdd, -id)
+
+        def visit(ids, dists):
+            for i, d in zip(ids.tolist(), dists.tolist()):
+                item = (-d, -i)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        def bound():
+            return -heap[0][0] if len(heap) == k else np.inf
+
+        if k > 0:
+            self._search(row, visit, bound)
+        return [(self.nodes[-i], -d) for d, i in sorted(heap, reverse=True)]
+
+    def range(self, u, eps):
+        """Get every node whose RDD to u is at most eps
+
+        Args:
+            u: node label
+            eps (float): largest RDD to report
+
+        Returns:
+            list: (node, rdd) tuples sorted by rdd, ties broken by node order
+        """
+        row = self.crds[self.index[u]]
+        found = []
+
+        def visit(ids, dists):
+            keep = dists <= eps
+            found.extend(zip(dists[keep].tolist(), ids[keep].tolist()))
+
+        self._search(row, visit, lambda: eps)
+        return [(self.nodes[i], d) for d, i in sorted(found)]
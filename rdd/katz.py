@@ -0,0 +1,242 @@
+"""Katz centrality by sparse linear solves.
+
+nx.katz_centrality finds the fixed point of x = alpha * A^T x + beta by
+power iteration in pure Python. The same vector is the solution of the
+linear system (I - alpha * A^T) x = beta, which this module solves on a
+SciPy CSR matrix: with conjugate gradients for undirected graphs (the
+matrix is symmetric positive definite exactly when the power iteration
+converges) and BiCGSTAB for directed ones.
+
+Ego graphs are induced subgraphs of the whole graph, so their Katz vectors
+are close to the restriction of the global one, which serves as the
+starting point of their solves. Many ego graphs are solved together as one
+block-diagonal system.
+
+The power iteration only converges when alpha is below 1 / rho(A), rho the
+spectral radius. Outside that range NetworkX raises
+PowerIterationFailedConvergence and so does this module, rather than
+returning the solution of the linear system, which is no longer a
+centrality. The spectral radius of an induced subgraph is at most that of
+the graph, so one check on the whole graph covers every ego solve. The
+same holds for a BFS tree of an undirected graph, but not of a directed
+one: the tree is undirected and can have a larger spectral radius (a
+directed star has none, the star as a tree has sqrt(n - 1)), so those
+trees are checked on their own.
+"""
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+from rdd.cache import cached, graph_version
+from rdd.csr import bfs_layers, to_csr
+
+
+# defaults of nx.katz_centrality
+KATZ_ALPHA = 0.1
+KATZ_BETA = 1.0
+# relative residual the solves stop at
+KATZ_TOL = 1.0e-10
+
+
+def katz_adjacency(graph):
+    """Get the CSR adjacency of a CSRGraph, self loops included as in NetworkX"""
+    n = len(graph)
+    return sparse.csr_matrix((np.ones(len(graph.indices)), graph.indices, graph.indptr),
+                             shape=(n, n))
+
+
+def graph_katz_adjacency(network):
+    """Get katz_adjacency of network in CSR id order, cached per graph"""
+    return cached(network, 'katz_adjacency', lambda: katz_adjacency(to_csr(network)))
+
+
+def spectral_radius(adj):
+    """Get the largest absolute eigenvalue of a sparse adjacency matrix"""
+    n = adj.shape[0]
+    if n == 0 or adj.nnz == 0:
+        return 0.0
+    if n <= 64:
+        return float(np.abs(np.linalg.eigvals(adj.toarray())).max())
+    values = linalg.eigs(adj.astype(float), k=1, which='LM', return_eigenvectors=False)
+    return float(np.abs(values).max())
+
+
+def check_alpha(adj, alpha, max_iter=1000):
+    """Raise like nx.katz_centrality when its power iteration cannot converge"""
+    # the largest row sum bounds the spectral radius, try it before eigs
+    bound = float(np.asarray(adj.sum(axis=1)).max(initial=0))
+    if alpha * bound < 1 or alpha * spectral_radius(adj) < 1:
+        return
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def katz_solve(adj, alpha=KATZ_ALPHA, beta=KATZ_BETA, x0=None, tol=KATZ_TOL, max_iter=None,
+               symmetric=True):
+    """Solve (I - alpha * A^T) x = beta
+
+    Args:
+        adj: sparse adjacency matrix, possibly block diagonal
+        alpha (float): attenuation factor
+        beta (float): weight of every node
+        x0 (ndarray): starting vector, e.g. the global solution restricted
+            to the same nodes
+        tol (float): relative residual to stop at
+        max_iter (int): iteration cap of the solver, None for its default
+        symmetric (bool): adj is symmetric (undirected graph)
+
+    Returns:
+        ndarray: the unnormalized Katz vector
+    """
+    n = adj.shape[0]
+    if n == 0:
+        return np.empty(0)
+    system = (sparse.identity(n, format='csr') - alpha * adj.T).tocsr()
+    rhs = np.full(n, float(beta))
+    solver = linalg.cg if symmetric else linalg.bicgstab
+    x, info = solver(system, rhs, x0=x0, rtol=tol, atol=0.0, maxiter=max_iter)
+    if info != 0:
+        raise nx.PowerIterationFailedConvergence(info if info > 0 else max_iter)
+    return x
+
+
+def normalize(x):
+    """Scale a Katz vector to unit Euclidean length, as NetworkX does"""
+    norm = np.linalg.norm(x)
+    return x / norm if norm else x
+
+
+def _global_katz(network, alpha, beta, tol):
+    """Get the unnormalized Katz vector of network, None when it does not converge
+
+    Both outcomes are cached per graph, so a failing graph is only checked once.
+    """
+    def compute():
+        adj = graph_katz_adjacency(network)
+        try:
+            check_alpha(adj, alpha)
+            return katz_solve(adj, alpha, beta, tol=tol, symmetric=not network.is_directed())
+        except nx.PowerIterationFailedConvergence:
+            return None
+    return cached(network, ('katz_vector', alpha, beta, tol), compute)
+
+
+def global_katz(network, alpha=KATZ_ALPHA, beta=KATZ_BETA, tol=KATZ_TOL):
+    """Get the unnormalized Katz vector of network in CSR id order, cached per graph
+
+    Raises:
+        PowerIterationFailedConvergence: alpha is too large for network
+    """
+    x = _global_katz(network, alpha, beta, tol)
+    if x is None:
+        raise nx.PowerIterationFailedConvergence(1000)
+    return x
+
+
+def katz_centrality(network, alpha=KATZ_ALPHA, beta=KATZ_BETA, tol=KATZ_TOL, normalized=True):
+    """Katz centrality of every node, the sparse solve version of nx.katz_centrality
+
+    Returns:
+        dict: node -> centrality
+    """
+    x = global_katz(network, alpha, beta, tol)
+    return dict(zip(to_csr(network).nodes, (normalize(x) if normalized else x).tolist()))
+
+
+def warm_start(network, ids, alpha=KATZ_ALPHA, beta=KATZ_BETA, tol=KATZ_TOL):
+    """Global Katz values of ids, or None when the global solve is not possible"""
+    x = _global_katz(network, alpha, beta, tol)
+    return None if x is None else x[ids]
+
+
+def subgraph_katz(network, ids, alpha=KATZ_ALPHA, beta=KATZ_BETA, tol=KATZ_TOL, normalized=True):
+    """Katz centrality on the subgraph induced by CSR ids, started from the global solution
+
+    Args:
+        network: the whole networkx Graph
+        ids (ndarray): CSR ids of the subgraph's nodes
+        alpha, beta: Katz parameters
+        tol (float): relative residual to stop at
+        normalized (bool): scale to unit length
+
+    Returns:
+        ndarray: centrality of each of ids
+    """
+    adj = graph_katz_adjacency(network)[ids][:, ids]
+    x0 = warm_start(network, ids, alpha, beta, tol)
+    if x0 is None:
+        check_alpha(adj, alpha)
+    x = katz_solve(adj, alpha, beta, x0=x0, tol=tol, symmetric=not network.is_directed())
+    return normalize(x) if normalized else x
+
+
+def ego_katz_table(network, radius, roots=None, batch_size=64, alpha=KATZ_ALPHA,
+                   beta=KATZ_BETA, tol=KATZ_TOL, normalized=True):
+    """Katz centrality inside every root's ego graph, solved in batches
+
+    The induced subgraphs of batch_size balls are stacked into one
+    block-diagonal system, started from the global solution.
+
+    Args:
+        network: a networkx Graph
+        radius (int): radius of the ego graphs
+        roots: root labels, defaults to every node
+        batch_size (int): balls per solve
+        alpha, beta: Katz parameters
+        tol (float): relative residual to stop at
+        normalized (bool): scale each ego vector to unit length
+
+    Returns:
+        dict: root -> (ids, values), the CSR ids of the ball in BFS order and
+        their Katz centrality inside the ego graph
+    """
+    graph = to_csr(network)
+    adj = graph_katz_adjacency(network)
+    roots = graph.nodes if roots is None else roots
+    table = {}
+    for start in range(0, len(roots), batch_size):
+        batch = roots[start:start + batch_size]
+        balls = [bfs_layers(graph, graph.node_id(root), radius)[0] for root in batch]
+        ids = np.concatenate(balls)
+        blocks = sparse.block_diag([adj[ball][:, ball] for ball in balls], format='csr')
+        x0 = warm_start(network, ids, alpha, beta, tol)
+        if x0 is None:
+            check_alpha(blocks, alpha)
+        x = katz_solve(blocks, alpha, beta, x0=x0, tol=tol, symmetric=not network.is_directed())
+        offset = 0
+        for root, ball in zip(batch, balls):
+            values = x[offset:offset + len(ball)]
+            table[root] = (ball, normalize(values) if normalized else values)
+            offset += len(ball)
+    return table
+
+
+def katz_table_measure(network, radius, roots=None, batch_size=64, alpha=KATZ_ALPHA,
+                       beta=KATZ_BETA, tol=KATZ_TOL):
+    """Build a local_graph_katz_centrality measure backed by ego_katz_table
+
+    Works like rdd.ego_triangles.triangle_table_measure: node lists of the
+    precomputed balls are answered from the table while network is
+    unchanged, anything else is passed on to local_graph_katz_centrality.
+
+    Returns:
+        function: a measure function named local_graph_katz_centrality
+    """
+    from rdd.measures import local_graph_katz_centrality
+
+    graph = to_csr(network)
+    version = graph_version(network)
+    table = ego_katz_table(network, radius, roots, batch_size, alpha, beta, tol)
+
+    def measure(target_network, node_list):
+        names = getattr(node_list, 'names', None)
+        entry = None
+        if target_network is network and names and graph_version(network) == version:
+            entry = table.get(names[int(np.argmin(node_list.radii))])
+        if entry is None or len(entry[0]) != len(names):
+            return local_graph_katz_centrality(target_network, node_list)
+        ball, values = entry
+        lookup = dict(zip(ball.tolist(), values.tolist()))
+        return [lookup[graph.index[name]] for name in names]
+
+    measure.__name__ = 'local_graph_katz_centrality'
+    return measure
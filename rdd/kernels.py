@@ -0,0 +1,43 @@
+"""Radius weighting kernels for RDD.
+
+The RDD sums |crd1[r] - crd2[r]| over the radii r, weighted by a kernel.
+A kernel is a function length -> ndarray giving the weight of radius 0 to
+length - 1, so the whole sum is one weighted reduction over a CRD block.
+The default is exp(-r), the weight of rdd.RDD.rdd_default_scale.
+
+Kernels are built with functools.partial over module level functions so
+they can be pickled and sent to worker processes (see rdd.parallel).
+"""
+from functools import partial
+import math
+import numpy as np
+
+
+def _exp_weights(length, rate):
+    return np.array([math.exp(-rate * r) for r in range(length)])
+
+
+def _power_weights(length, alpha):
+    return np.arange(1, length + 1, dtype=float) ** -alpha
+
+
+def _uniform_weights(length):
+    return np.ones(length)
+
+
+def exp_kernel(rate=1.0):
+    """exp(-rate * r) weights, rate 1 is the default RDD scale"""
+    return partial(_exp_weights, rate=rate)
+
+
+def power_kernel(alpha=1.0):
+    """(r + 1) ** -alpha weights, decaying slower than exp for the outer radii"""
+    return partial(_power_weights, alpha=alpha)
+
+
+def uniform_kernel():
+    """Weight 1 for every radius, the plain L1 distance between CRDs"""
+    return _uniform_weights
+
+
+DEFAULT_KERNEL = exp_kernel()
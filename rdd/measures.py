@@ -7,6 +7,14 @@ They need to return lists of numbers representing values for each node.
 
 
 from rdd.RDD import *
+from rdd.cache import cached
+from rdd.cliques import clique_counts
+from rdd.ego import ball_ids, ego_measure
+from rdd.harmonic import harmonic_centrality, subgraph_harmonic
+from rdd.katz import katz_centrality, subgraph_katz, warm_start
+from rdd.morgan import morgan_iterations
+from rdd.tree import (tree_cliques, tree_degree, tree_harmonic_centrality, tree_katz_centrality,
+                      tree_pagerank, tree_triangles)
 
 
 def global_graph_degree(network, node_list):
@@ -23,8 +31,8 @@ def global_graph_degree(network, node_list):
 
     """
     measures = []
-    for node in node_list:
-        measures.append(network.degree[node.name])
+    for name in node_names(node_list):
+        measures.append(network.degree[name])
 
     return measures
 
@@ -42,14 +50,10 @@ def local_graph_degree(network, node_list):
     """
 
     measures = []
-    list_of_nodes = []
-    for node in node_list:
-        list_of_nodes.append(node.name)
+    degree_dic = ego_measure(network, node_list, 'degree', lambda g: dict(g.degree))
 
-    local_graph = nodes_to_graph(network, list_of_nodes)
-
-    for node in node_list:
-        measures.append(local_graph.degree[node.name])
+    for name in node_names(node_list):
+        measures.append(degree_dic[name])
 
     return measures
 
@@ -65,27 +69,8 @@ def local_path_degree(network, node_list):
         measures: list of degrees created by graph made of shortest paths
 
     """
-    measures = []
-    largest_rad = -1
-    target_node = -1
-
-    for node in node_list:
-        # find largest radius
-        if node.radius >= largest_rad:
-            largest_rad = node.radius
-
-        if node.radius == 0:
-            target_node = node.name
-
-    local_graph = paths_to_graph(
-        nx.single_source_shortest_path(network, target_node, largest_rad))
-
-    for node in node_list:
-        # if local_graph.degree[node.name] > 1:
-        # print(f'Name : {node.name} Degree: {local_graph.degree[node.name]}')
-        measures.append(local_graph.degree[node.name])
-
-    return measures
+    parents, _ = bfs_tree_parents(network, node_list)
+    return tree_degree(parents).tolist()
 
 
 def global_graph_triangles(network, node_list):
@@ -102,9 +87,9 @@ def global_graph_triangles(network, node_list):
 
     """
     measures = []
-    triangle_dic = nx.triangles(network)
-    for node in node_list:
-        measures.append(triangle_dic[node.name])
+    triangle_dic = cached(network, 'triangles', lambda: nx.triangles(network))
+    for name in node_names(node_list):
+        measures.append(triangle_dic[name])
 
     return measures
 
@@ -121,15 +106,9 @@ def local_graph_triangles(network, node_list):
 
     """
     measures = []
-    list_of_nodes = []
-    for node in node_list:
-        list_of_nodes.append(node.name)
-
-    local_graph = nodes_to_graph(network, list_of_nodes)
-
-    triangle_dic = nx.triangles(local_graph)
-    for node in node_list:
-        measures.append(triangle_dic[node.name])
+    triangle_dic = ego_measure(network, node_list, 'triangles', nx.triangles)
+    for name in node_names(node_list):
+        measures.append(triangle_dic[name])
 
     return measures
 
@@ -145,25 +124,8 @@ def local_path_triangles(network, node_list):
         measures: list of how many triangles each node is a part of
 
     """
-    measures = []
-    largest_rad = -1
-    target_node = -1
-
-    for node in node_list:
-        # find largest radius
-        if node.radius >= largest_rad:
-            largest_rad = node.radius
-
-        if node.radius == 0:
-            target_node = node.name
-
-    local_graph = paths_to_graph(
-        nx.single_source_shortest_path(network, target_node, largest_rad))
-    triangle_dic = nx.triangles(local_graph)
-    for node in node_list:
-        measures.append(triangle_dic[node.name])
-
-    return measures
+    parents, _ = bfs_tree_parents(network, node_list)
+    return tree_triangles(parents).tolist()
 
 
 def global_graph_clique(network, node_list):
@@ -180,10 +142,9 @@ def global_graph_clique(network, node_list):
 
     """
     measures = []
-    for node in node_list:
-        cliques = nx.algorithms.clique.cliques_containing_node(
-            network, node.name)
-        measures.append(len(cliques))
+    clique_dic = cached(network, 'cliques', lambda: clique_counts(network))
+    for name in node_names(node_list):
+        measures.append(clique_dic[name])
 
     return measures
 
@@ -202,43 +163,17 @@ def local_graph_clique(network, node_list):
 
     """
     measures = []
-    list_of_nodes = []
-    for node in node_list:
-        list_of_nodes.append(node.name)
-
-    local_graph = nodes_to_graph(network, list_of_nodes)
+    clique_dic = ego_measure(network, node_list, 'cliques', clique_counts)
 
-    for node in node_list:
-        cliques = nx.algorithms.clique.cliques_containing_node(
-            local_graph, node.name)
-        measures.append(len(cliques))
+    for name in node_names(node_list):
+        measures.append(clique_dic[name])
 
     return measures
 
 
 def local_path_clique(network, node_list):
-    measures = []
-    largest_rad = -1
-    target_node = -1
-
-    for node in node_list:
-        if node.radius >= largest_rad:
-            largest_rad = node.radius
-
-        if node.radius == 0:
-            target_node = node.name
-
-    local_graph = paths_to_graph(
-        nx.single_source_shortest_path(network, target_node, largest_rad))
-
-    for node in node_list:
-        # if local_graph.degree[node.name] > 1:
-        # print(f'Name : {node.name} Degree: {local_graph.degree[node.name]}')
-        cliques = nx.algorithms.clique.cliques_containing_node(
-            local_graph, node.name)
-        measures.append(len(cliques))
-
-    return measures
+    parents, _ = bfs_tree_parents(network, node_list)
+    return tree_cliques(parents).tolist()
 
 
 def global_graph_katz_centrality(network, node_list):
@@ -255,9 +190,9 @@ def global_graph_katz_centrality(network, node_list):
 
     """
     measures = []
-    katz_dic = nx.katz_centrality(network)
-    for node in node_list:
-        measures.append(katz_dic[node.name])
+    katz_dic = cached(network, 'katz_centrality', lambda: katz_centrality(network))
+    for name in node_names(node_list):
+        measures.append(katz_dic[name])
 
     return measures
 
@@ -276,15 +211,10 @@ def local_graph_katz_centrality(network, node_list):
 
     """
     measures = []
-    list_of_nodes = []
-    for node in node_list:
-        list_of_nodes.append(node.name)
-
-    local_graph = nodes_to_graph(network, list_of_nodes)
-
-    katz_dic = nx.katz_centrality(local_graph)
-    for node in node_list:
-        measures.append(katz_dic[node.name])
+    katz_dic = ego_measure(network, node_list, 'katz_centrality', lambda g: dict(zip(
+        g, subgraph_katz(network, [to_csr(network).index[name] for name in g]).tolist())))
+    for name in node_names(node_list):
+        measures.append(katz_dic[name])
 
     return measures
 
@@ -300,26 +230,11 @@ def local_path_katz_centrality(network, node_list):
         measures: list of how many triangles each node is a part of
 
     """
-    measures = []
-    largest_rad = -1
-    target_node = -1
-
-    for node in node_list:
-        # find largest radius
-        if node.radius >= largest_rad:
-            largest_rad = node.radius
-
-        if node.radius == 0:
-            target_node = node.name
-
-    local_graph = paths_to_graph(
-        nx.single_source_shortest_path(network, target_node, largest_rad))
-
-    katz_dic = nx.katz_centrality(local_graph)
-    for node in node_list:
-        measures.append(katz_dic[node.name])
-
-    return measures
+    parents, _ = bfs_tree_parents(network, node_list)
+    ids = [to_csr(network).index[name] for name in node_names(node_list)]
+    x0 = warm_start(network, ids)
+    checked = x0 is not None and not network.is_directed()
+    return tree_katz_centrality(parents, x0=x0, checked=checked).tolist()
 
 
 def global_graph_harmonic_centrality(network, node_list):
@@ -336,9 +251,10 @@ def global_graph_harmonic_centrality(network, node_list):
 
     """
     measures = []
-    harmonic_dic = nx.harmonic_centrality(network)
-    for node in node_list:
-        measures.append(harmonic_dic[node.name])
+    harmonic_dic = cached(network, 'harmonic_centrality',
+                          lambda: harmonic_centrality(network))
+    for name in node_names(node_list):
+        measures.append(harmonic_dic[name])
 
     return measures
 
@@ -356,18 +272,7 @@ def local_graph_harmonic_centrality(network, node_list):
         a list of local cliques for each node in node list
 
     """
-    measures = []
-    list_of_nodes = []
-    for node in node_list:
-        list_of_nodes.append(node.name)
-
-    local_graph = nodes_to_graph(network, list_of_nodes)
-
-    harmonic_dic = nx.harmonic_centrality(local_graph)
-    for node in node_list:
-        measures.append(harmonic_dic[node.name])
-
-    return measures
+    return subgraph_harmonic(network, ball_ids(network, node_list)).tolist()
 
 
 def local_path_harmonic_centrality(network, node_list):
@@ -381,26 +286,8 @@ def local_path_harmonic_centrality(network, node_list):
         measures: list of how many triangles each node is a part of
 
     """
-    measures = []
-    largest_rad = -1
-    target_node = -1
-
-    for node in node_list:
-        # find largest radius
-        if node.radius >= largest_rad:
-            largest_rad = node.radius
-
-        if node.radius == 0:
-            target_node = node.name
-
-    local_graph = paths_to_graph(
-        nx.single_source_shortest_path(network, target_node, largest_rad))
-
-    harmonic_dic = nx.harmonic_centrality(local_graph)
-    for node in node_list:
-        measures.append(harmonic_dic[node.name])
-
-    return measures
+    parents, radii = bfs_tree_parents(network, node_list)
+    return tree_harmonic_centrality(parents, radii).tolist()
 
 
 def global_graph_pagerank(network, node_list):
@@ -417,9 +304,10 @@ def global_graph_pagerank(network, node_list):
 
     """
     measures = []
-    pagerank_dic = nx.pagerank(network, max_iter=1000)
-    for node in node_list:
-        measures.append(pagerank_dic[node.name])
+    pagerank_dic = cached(network, 'pagerank',
+                          lambda: nx.pagerank(network, max_iter=1000))
+    for name in node_names(node_list):
+        measures.append(pagerank_dic[name])
 
     return measures
 
@@ -438,15 +326,10 @@ def local_graph_pagerank(network, node_list):
 
     """
     measures = []
-    list_of_nodes = []
-    for node in node_list:
-        list_of_nodes.append(node.name)
-
-    local_graph = nodes_to_graph(network, list_of_nodes)
-
-    pagerank_dic = nx.pagerank(local_graph, max_iter=1000)
-    for node in node_list:
-        measures.append(pagerank_dic[node.name])
+    pagerank_dic = ego_measure(network, node_list, 'pagerank',
+                               lambda g: nx.pagerank(g, max_iter=1000))
+    for name in node_names(node_list):
+        measures.append(pagerank_dic[name])
 
     return measures
 
@@ -462,63 +345,23 @@ def local_path_pagerank(network, node_list):
         measures: list of how many triangles each node is a part of
 
     """
-    measures = []
-    largest_rad = -1
-    target_node = -1
-
-    for node in node_list:
-        # find largest radius
-        if node.radius >= largest_rad:
-            largest_rad = node.radius
-
-        if node.radius == 0:
-            target_node = node.name
-
-    local_graph = paths_to_graph(
-        nx.single_source_shortest_path(network, target_node, largest_rad))
+    parents, _ = bfs_tree_parents(network, node_list)
+    return tree_pagerank(parents, max_iter=1000).tolist()
 
-    pagerank_dic = nx.pagerank(local_graph, max_iter=1000)
-    for node in node_list:
-        measures.append(pagerank_dic[node.name])
 
-    return measures
+def morgan_index(target_network, target_iterations=8):
+    """Get a dictionary node->Morgan index after target_iterations rounds"""
+    values = morgan_iterations(target_network, target_iterations)[-1]
+    return dict(zip(to_csr(target_network).nodes, values.tolist()))
 
 
 def global_graph_morgan_index(target_network, node_list, target_iterations=8):
-    network = target_network.copy()
-    for iteration in range(target_iterations):
-        new_measures = []
-        for node in network:
-            if(iteration == 0):
-                network.nodes[node]['measure'] = 1
-            else:
-                neighbors = list(network.neighbors(node))
-                total_new_measure = 0
-
-                for neighbor in neighbors:
-                    total_new_measure = total_new_measure + \
-                        network.nodes[neighbor]['measure']
-
-                new_measures.append(total_new_measure)
-
-                # print(neighbors)
-
-        # print(new_measures)
-
-        if(iteration != 0):
-            count = 0
-            for node in network:
-                network.nodes[node]['measure'] = new_measures[count]
-                # print(network.nodes[node]['measure'])
-                count = count+1
-
-    # returning_measures = []
-    # for node in network:
-    #     returning_measures.append(network.nodes[node]['measure'])
+    morgan_dic = cached(target_network, ('morgan_index', target_iterations),
+                        lambda: morgan_index(target_network, target_iterations))
 
     returning_measures = []
-    for node in node_list:
-        returning_measures.append(network.nodes[node.name]['measure'])
+    for name in node_names(node_list):
+        returning_measures.append(morgan_dic[name])
 
     return returning_measures
 
@@ -0,0 +1,63 @@
+"""Morgan index by sparse products.
+
+The Morgan index starts every node at 1 and then, once per iteration,
+replaces each node's value by the sum of its neighbors' values, so after
+k + 1 iterations it is A^k 1: the number of k-step walks leaving the node.
+This module computes every iteration with one sparse product each.
+
+Walk counts grow like the k-th power of the degree and leave the range of
+int64 on dense graphs within the default 8 iterations. Values stay int64
+while the next product provably fits, and switch to Python integers, as the
+old per-node loop produced, once it might not.
+"""
+import numpy as np
+from scipy import sparse
+from rdd.cache import cached
+from rdd.csr import to_csr
+
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def _spread(graph, adj, values):
+    """Sum values over the out-neighbors of every node"""
+    if values.dtype != object:
+        return adj @ values
+    # exact big integer sums, empty rows stay 0
+    sums = np.zeros(len(graph), dtype=object)
+    starts = graph.indptr[:-1]
+    rows = np.flatnonzero(graph.indptr[1:] > starts)
+    if len(rows):
+        sums[rows] = np.add.reduceat(values[graph.indices], starts[rows])
+    return sums
+
+
+def morgan_iterations(network, iterations=8):
+    """Get the Morgan index of every node after each iteration, cached per graph
+
+    Args:
+        network: a networkx Graph object
+        iterations (int): number of iterations, at least 1
+
+    Returns:
+        ndarray: (iterations, n) array in rdd.csr id order, row k holds the
+        index after k + 1 iterations; int64, or object holding Python ints
+        when the values outgrow int64
+    """
+    def compute():
+        graph = to_csr(network)
+        n = len(graph)
+        adj = sparse.csr_matrix((np.ones(len(graph.indices), dtype=np.int64), graph.indices,
+                                 graph.indptr), shape=(n, n))
+        largest_degree = int(np.diff(graph.indptr).max(initial=0))
+        values = np.ones(n, dtype=np.int64)
+        rows = [values]
+        for _ in range(1, iterations):
+            if values.dtype != object and largest_degree and \
+                    int(values.max()) > INT64_MAX // largest_degree:
+                values = values.astype(object)
+            values = _spread(graph, adj, values)
+            rows.append(values)
+        dtype = object if values.dtype == object else np.int64
+        return np.array(rows, dtype=dtype).reshape(len(rows), n)
+    return cached(network, ('morgan_iterations', iterations), compute)
@@ -5,6 +5,9 @@ from sklearn.cluster import KMeans
 from sklearn.cluster import MeanShift
 from rdd.measures import *
 from rdd import RDD
+from rdd.ego import ego_result
+from rdd.parallel import effective_n_jobs, parallel_rdd_matrix
+from rdd.storage import load_rdd_matrix
 import scipy.cluster.hierarchy as shc
 from sklearn.cluster import AgglomerativeClustering
 from sklearn_extra.cluster import KMedoids
@@ -36,11 +39,7 @@ def simrank(G, u):
 
 def simrank_radius(G, u, r):
     
-    real_paths1 = nx.single_source_shortest_path(G, u, r)
-
-    g = G.subgraph(list(real_paths1.keys()))
-
-    sim = nx.simrank_similarity(g, u)
+    sim = ego_result(G, u, r, 'simrank', lambda g: nx.simrank_similarity(g, u))
     
     sim_list = []
     node_list = []
@@ -110,7 +109,7 @@ def k_means_matrix(g, m, k):
     Returns:
         DataFrame: A DataFrame with node_name and cluster columns
     """
-    np_of_values = np.array(m)
+    np_of_values = np.asarray(m)
     kmeans = KMeans(n_clusters=k)
     cluster_data = kmeans.fit_predict(np_of_values)
     
@@ -119,6 +118,37 @@ def k_means_matrix(g, m, k):
     return kmeans_results
 
 
+def all_rdds_matrix(g, r, measure, n_jobs=None, rdd_file=None):
+    """Get a DataFrame of RDD values between all nodes, one column per node.
+
+    Args:
+        g (Graph): NetworkX Graph
+        r (int): radius
+        measure (function): A measure function
+        n_jobs (int): number of processes, -1 for every core (see rdd.parallel)
+        rdd_file (str): a matrix saved by rdd.storage.write_rdd_matrix for g,
+            returned as a read-only memory map instead of computing the RDDs;
+            its stored node order must be list(g)
+
+    Returns:
+        DataFrame or np.memmap: column u holds the RDD between u and every
+        node of g; with rdd_file, the n x n memory map in list(g) order
+    """
+    if rdd_file is not None:
+        return load_rdd_matrix(rdd_file, nodes=list(g))
+    if effective_n_jobs(n_jobs) > 1:
+        return pd.DataFrame(parallel_rdd_matrix(g, r, measure, n_jobs=n_jobs).T,
+                            columns=list(g))
+
+    all_rdds_df = pd.DataFrame()
+    for target_one in g:
+        rdd_list = []
+        for target_two in g:
+            rdd_list.append(RDD.realworld_distance_compare(g, target_one, target_two, measure, r))
+        all_rdds_df[target_one] = rdd_list
+    return all_rdds_df
+
+
 def k_means_other(df, target_columns, k=3):
     kmeans = KMeans(n_clusters=k) 
     
@@ -130,17 +160,10 @@ def k_means_other(df, target_columns, k=3):
 
     return df
 
-def k_means_matrix_clustering(g, r, measure, num_cluster):
-    all_rdds_df = pd.DataFrame() 
-
-    for target_one in g:
-        rdd_list = []
-        for target_two in g:
-            rdd_list.append(RDD.realworld_distance_compare(g, target_one, target_two, measure[0], r))
-        all_rdds_df[target_one] = rdd_list
-    
-    data = all_rdds_df
-    np_of_rdds = np.array(data)
+def k_means_matrix_clustering(g, r, measure, num_cluster, n_jobs=None, rdd_file=None):
+    # measure is a list of measures, only needed when no rdd_file is given
+    data = all_rdds_matrix(g, r, measure[0] if rdd_file is None else None, n_jobs, rdd_file)
+    np_of_rdds = np.asarray(data)
     kmeans = KMeans(n_clusters=num_cluster)
     cluster_data = kmeans.fit_predict(np_of_rdds)
 
@@ -181,16 +204,8 @@ def mean_shift_other(df, target_columns):
 
     return df
 
-def agglomerative_hierarchical_clustering(g, r, measure, num_cluster):
-    all_rdds_df = pd.DataFrame() 
-
-    for target_one in g:
-        rdd_list = []
-        for target_two in g:
-            rdd_list.append(RDD.realworld_distance_compare(g, target_one, target_two, measure, r))
-        all_rdds_df[target_one] = rdd_list
-    
-    data = all_rdds_df
+def agglomerative_hierarchical_clustering(g, r, measure, num_cluster, n_jobs=None, rdd_file=None):
+    data = all_rdds_matrix(g, r, measure, n_jobs, rdd_file)
     # dend = shc.dendrogram(shc.linkage(data, method='ward'))
 
     cluster = AgglomerativeClustering(n_clusters=num_cluster, affinity='euclidean', linkage='ward')
@@ -210,17 +225,9 @@ def agglomerative_hierarchical_clustering(g, r, measure, num_cluster):
 
     return df
 
-def kmedoid_clustering(g, r, measure, num_cluster):
-    all_rdds_df = pd.DataFrame() 
-
-    for target_one in g:
-        rdd_list = []
-        for target_two in g:
-            rdd_list.append(RDD.realworld_distance_compare(g, target_one, target_two, measure, r))
-        all_rdds_df[target_one] = rdd_list
-    
-    data = all_rdds_df
-    np_of_rdds = np.array(data)
+def kmedoid_clustering(g, r, measure, num_cluster, n_jobs=None, rdd_file=None):
+    data = all_rdds_matrix(g, r, measure, n_jobs, rdd_file)
+    np_of_rdds = np.asarray(data)
     kmedoids = KMedoids(n_clusters=num_cluster, random_state=0).fit(np_of_rdds)
     cluster_data = kmedoids.labels_
 
@@ -251,7 +258,7 @@ def kmedoid_clustering2(g, m, k):
         DataFrame: A DataFrame with node_name and cluster columns
     """
     # KMedoids requires a numpy array
-    np_of_values = np.array(m)
+    np_of_values = np.asarray(m)
     kmedoids = KMedoids(n_clusters=k, random_state=0).fit(np_of_values)
     kmedoid_results = pd.DataFrame({'node_name': g.nodes(),
                                     'cluster': kmedoids.labels_})
@@ -0,0 +1,162 @@
+"""Parallel all-pairs RDD.
+
+This module shards the source rows of an RDD matrix across a process pool.
+The work runs in two phases: workers first build the CRD of their share
+of roots, then compare blocks of rows against the full CRD matrix and
+write straight into an output matrix held in shared memory.
+
+The graph reaches the workers as its CSR arrays in shared memory, and a
+global measure as its precomputed value per node, so neither is pickled
+whatever the start method. Local measures are evaluated on the NetworkX
+graph itself, which workers then receive once each: inherited under fork,
+pickled under spawn or forkserver. The pool uses the platform's default
+start method.
+"""
+import math
+import multiprocessing as mp
+import os
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from rdd.crd import global_measure_values, is_global_measure, layer_crd, node_crd, pad_crd, \
+    pairwise_rdd
+from rdd.csr import CSRGraph, bfs_layers, to_csr
+
+
+# per-process state filled in by _init_worker
+_worker = {}
+
+
+def _share(array, blocks):
+    """Copy an array into a new shared memory block
+
+    Args:
+        array (ndarray): data to share
+        blocks (list): created blocks, the new one is appended for cleanup
+
+    Returns:
+        tuple: (name, shape, dtype) to pass to _attach
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block.name, array.shape, array.dtype.str
+
+
+def _attach(name, shape, dtype=np.float64):
+    """Get a NumPy view of a shared memory block, attaching once per worker"""
+    if name not in _worker:
+        block = shared_memory.SharedMemory(name=name)
+        _worker[name] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    return _worker[name][1]
+
+
+def _init_worker(indptr, indices, values, network, measure, radius):
+    _worker.clear()
+    graph = CSRGraph.from_arrays(_attach(*indptr), _attach(*indices), network)
+    _worker.update(graph=graph, measure=measure, radius=radius,
+                   values=None if values is None else _attach(*values))
+
+
+def _crd_task(roots):
+    graph, measure, radius = _worker['graph'], _worker['measure'], _worker['radius']
+    values = _worker['values']
+    if values is None:
+        return [node_crd(graph, graph.nodes[u], measure, radius) for u in roots]
+    crds = []
+    for u in roots:
+        order, dist = bfs_layers(graph, u, radius)
+        crds.append(layer_crd(dist, values[order]))
+    return crds
+
+
+def _rdd_task(args):
+    start, stop, crd_name, crd_shape, out_name, out_shape, block_size, kernel = args
+    shared = _attach(crd_name, crd_shape)
+    crds, layers = shared[:, 1:], shared[:, 0].astype(np.int64)
+    out = _attach(out_name, out_shape)
+    out[start:stop] = pairwise_rdd(crds[start:stop], layers[start:stop], crds, layers,
+                                   block_size=block_size, kernel=kernel)
+
+
+def _shards(n, size):
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def effective_n_jobs(n_jobs):
+    """Number of worker processes for n_jobs, following the scikit-learn convention
+
+    None means 1, -1 means every core, -2 every core but one, and so on.
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+def parallel_rdd_matrix(G, r, measure, nodes=None, n_jobs=-1, block_size=64, kernel=None):
+    """Get the RDD between all pairs of nodes using a process pool.
+
+    The result is deterministic and identical to the serial functions in
+    rdd.RDD, whatever the number of workers.
+
+    Args:
+        G (Graph): NetworkX Graph
+        r (int): radius
+        measure (function): A measure function, must be importable by name
+            when the pool does not fork
+        nodes (list): roots to compare, defaults to every node of G
+        n_jobs (int): number of processes, see effective_n_jobs
+        block_size (int): rows per broadcast block in the pairwise phase
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        ndarray: out[i, j] is the RDD between nodes[i] and nodes[j]
+    """
+    graph = to_csr(G)
+    nodes = list(graph.nodes if nodes is None else nodes)
+    n = len(nodes)
+    if n == 0:
+        return np.empty((0, 0))
+    n_jobs = min(effective_n_jobs(n_jobs), n)
+    roots = np.array([graph.node_id(u) for u in nodes], dtype=np.int64)
+
+    blocks = []
+    if os.name == 'posix':
+        # start the tracker now so forked workers share it instead of each
+        # starting their own and reporting the parent's blocks as leaked
+        resource_tracker.ensure_running()
+    try:
+        indptr, indices = _share(graph.indptr, blocks), _share(graph.indices, blocks)
+        if is_global_measure(measure):
+            values, network = _share(global_measure_values(graph, measure), blocks), None
+        else:
+            values, network = None, G
+        with mp.get_context().Pool(n_jobs, initializer=_init_worker,
+                                   initargs=(indptr, indices, values, network, measure, r)) as pool:
+            rows = []
+            chunk = max(1, math.ceil(n / (4 * n_jobs)))
+            for part in pool.map(_crd_task, [roots[start:stop] for start, stop
+                                             in _shards(n, chunk)]):
+                rows.extend(part)
+
+            # CRD matrix in shared memory, column 0 holds the unpadded lengths
+            width = max(len(row) for row in rows)
+            crd_shape = (n, width + 1)
+            table = np.empty(crd_shape)
+            for i, row in enumerate(rows):
+                table[i, 0] = len(row)
+                table[i, 1:] = pad_crd(row, width)
+            crd_name = _share(table, blocks)[0]
+
+            out_shape = (n, n)
+            out_block = shared_memory.SharedMemory(create=True, size=8 * n * n)
+            blocks.append(out_block)
+            pool.map(_rdd_task, [(start, stop, crd_name, crd_shape, out_block.name, out_shape,
+                                  block_size, kernel)
+                                 for start, stop in _shards(n, block_size)])
+            return np.ndarray(out_shape, dtype=np.float64, buffer=out_block.buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
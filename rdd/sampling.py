@@ -0,0 +1,260 @@
+"""Approximate RDD by sampling.
+
+On very large graphs a few hops from a hub reach most of the graph, so
+even searching the ball, let alone measuring it, dominates the cost of a
+comparison. This module never expands a whole layer: only a random sample
+of each BFS frontier is expanded, and the size and measure mass of the
+next layer are estimated from the neighbors of the sampled nodes.
+
+The layers are searched in full while they hold at most sample_size
+nodes. From the first larger layer on, every sampled node x of layer r
+carries a weight w_x, the number of layer nodes it stands for. A node y of
+layer r + 1 has k_y parents in layer r, so summing w_x / k_y over its
+sampled parents and then m(y) over the reached nodes estimates the mass of
+layer r + 1 without bias. That sum is itself taken over a uniform sample of
+the reached nodes, scaled up to their count, and the same sample is
+expanded next, so each layer costs about sample_size adjacency lists
+whatever its size.
+
+Telling whether a neighbor lies in layer r + 1 and counting k_y need the
+exact distance of a few nodes beyond the full layers. "Within t hops" is
+worked out on demand (within t - 1 hops, or next to a node that is) and
+remembered per ball, so the replicates below share those reads.
+
+Several independent sampled searches (replicates) are run per ball. The
+CRD estimate is their mean and its variance comes from their spread, so
+the RDD interval adds, for every radius, t standard errors of the
+difference between the two CRD entries weighted by the radius kernel. Since
+||a| - |b|| <= |a - b| this covers the error of each term, so the interval
+is conservative rather than exact.
+
+The samples are doubled until the interval is narrow enough, but never
+past the point where the reads of the sampled rounds, counting the next
+one, would pass those of the exact search, estimated from the weighted
+degrees of the sampled nodes; the exact value is computed instead. The
+same happens when a single sampled search already reads as much as the
+exact one, as on small graphs or on dense balls of hubs.
+
+Only global measures (see rdd.crd.is_global_measure) can be sampled: a
+local measure depends on the whole ball, so for those the exact value is
+returned with a zero-width interval.
+"""
+import numpy as np
+from scipy import stats
+from rdd.crd import (crd_distance, global_measure_values, is_global_measure, node_crd, pad_crd,
+                     radius_weights)
+from rdd.csr import neighbors_of, next_layer, to_csr
+
+
+class _Ball:
+    """Exact distances from a root, learned lazily and shared by its sampled searches
+
+    The first layers are searched in full while they are small. Beyond
+    them, whether a node lies within some depth of the root is worked out
+    on demand from its neighborhood and remembered, so each adjacency list
+    is read at most once per depth however many searches ask.
+
+    Attributes:
+    ---------
+        graph: the CSRGraph searched
+        layers: the layers known in full, layers[r] holds the ids r hops away
+        work: number of adjacency entries read so far
+    """
+
+    def __init__(self, graph, root):
+        self.graph = graph
+        self.degree = graph.indptr[1:] - graph.indptr[:-1]
+        self.layers = [np.array([root], dtype=np.int64)]
+        self.work = 0
+        # hops from the root of the ids in the full layers, -1 for the rest
+        self._dist = np.full(len(graph), -1, dtype=np.int64)
+        self._dist[root] = 0
+        # depth -> int8 per id: 1 within depth of the root, -1 not, 0 unknown
+        self._within = {}
+
+    def grow(self):
+        """Search the last full layer, adding the next one; False when there is none"""
+        frontier = self.layers[-1]
+        if frontier.size == 0:
+            return False
+        self.work += int(self.degree[frontier].sum())
+        layer, _ = next_layer(self.graph, frontier, self._dist >= 0)
+        self._dist[layer] = len(self.layers)
+        self.layers.append(layer)
+        return layer.size > 0
+
+    def within(self, ids, depth):
+        """Get whether each of ids is at most depth hops from the root"""
+        if depth < len(self.layers) or self.layers[-1].size == 0:
+            dist = self._dist[ids]
+            return (dist >= 0) & (dist <= depth)
+        status = self._within.setdefault(depth, np.zeros(len(self.graph), dtype=np.int8))
+        todo = np.unique(ids[status[ids] == 0])
+        if todo.size:
+            # within depth: within depth - 1 or next to a node that is
+            inner = self.within(todo, depth - 1)
+            rest = todo[~inner]
+            nbrs = neighbors_of(self.graph, rest)
+            self.work += len(nbrs)
+            owner = np.repeat(np.arange(len(rest)), self.degree[rest])
+            near = np.bincount(owner, weights=self.within(nbrs, depth - 1),
+                               minlength=len(rest)) > 0
+            status[todo[inner]] = 1
+            status[rest] = np.where(near, 1, -1)
+        return status[ids] == 1
+
+
+def _sampled_crd(ball, values, radius, sample_size, rng):
+    """Estimate a CRD by expanding a sample of each large BFS frontier
+
+    Args:
+        ball (_Ball): distance facts about the root
+        values (ndarray): measure value of every id
+        radius (int): maximum depth, None for the whole component
+        sample_size (int): nodes of each layer that are expanded
+        rng: numpy Generator
+
+    Returns:
+        tuple: (crd, exact, cost) the estimated CRD, whether no layer was
+        sampled and the estimated number of adjacency entries an exact
+        search would read
+    """
+    graph, degree = ball.graph, ball.degree
+    while (radius is None or len(ball.layers) <= radius) and \
+            0 < len(ball.layers[-1]) <= sample_size and ball.grow():
+        pass
+    layers = [layer for layer in ball.layers[:None if radius is None else radius + 1] if layer.size]
+    mass = [float(values[layer].sum()) for layer in layers]
+    cost = float(sum(degree[layer].sum() for layer in layers[:-1]))
+    depth = len(layers) - 1
+    if ball.layers[-1].size == 0 or depth == radius:
+        return np.cumsum(mass), True, cost
+
+    # the last full layer is too large, expand a sample of it and of every
+    # layer after it
+    layer = layers[-1]
+    pick = rng.choice(len(layer), sample_size, replace=False)
+    sample, weights = layer[pick], np.full(sample_size, len(layer) / sample_size)
+    nbrs = None
+    while radius is None or depth < radius:
+        cost += float(weights @ degree[sample])
+        if nbrs is None:
+            nbrs = neighbors_of(graph, sample)
+            ball.work += len(nbrs)
+        owners = np.repeat(weights, degree[sample])
+        fresh = ~ball.within(nbrs, depth)
+        if not fresh.any():
+            break
+        nodes, inverse = np.unique(nbrs[fresh], return_inverse=True)
+        # weight of the sampled parents of each node of the next layer
+        reach = np.bincount(inverse, weights=owners[fresh])
+        pick = np.arange(len(nodes))
+        if len(nodes) > sample_size:
+            pick = np.sort(rng.choice(len(nodes), sample_size, replace=False))
+        scale = len(nodes) / len(pick)
+        picked = nodes[pick]
+        # the picked nodes are expanded next, so their adjacency is read
+        # once for their parent counts and for the next layer
+        nbrs = neighbors_of(graph, picked)
+        ball.work += len(nbrs)
+        owner = np.repeat(np.arange(len(picked)), degree[picked])
+        parent = ball.within(nbrs, depth) & ~ball.within(nbrs, depth - 1)
+        parents = np.bincount(owner, weights=parent, minlength=len(picked))
+        sample, weights = picked, scale * reach[pick] / parents
+        mass.append(float(weights @ values[picked]))
+        depth += 1
+    return np.cumsum(mass), False, cost
+
+
+def _replicated_crd(ball, values, radius, sample_size, replicates, rng):
+    """Run _sampled_crd replicates times, or once if the first run is exact or too costly
+
+    Returns:
+        tuple: (crd, var, state, cost) the mean CRD and the variance of that
+        mean per entry; state is 'exact' when nothing was sampled, 'costly'
+        when one sampled search reads at least as much as the exact search
+        would (crd and var are then None) and 'sampled' otherwise; cost is
+        the mean of the exact cost estimates of _sampled_crd
+    """
+    start = ball.work
+    crd, exact, cost = _sampled_crd(ball, values, radius, sample_size, rng)
+    if exact:
+        return crd, np.zeros(len(crd)), 'exact', cost
+    if ball.work - start >= cost:
+        return None, None, 'costly', cost
+    runs = [(crd, cost)] + [_sampled_crd(ball, values, radius, sample_size, rng)[::2]
+                            for _ in range(replicates - 1)]
+    length = max(len(row) for row, _ in runs)
+    rows = np.array([pad_crd(row, length) for row, _ in runs])
+    cost = float(np.mean([cost for _, cost in runs]))
+    return rows.mean(axis=0), rows.var(axis=0, ddof=1) / len(rows), 'sampled', cost
+
+
+def approx_realworld_distance_compare(network, u, v, measure, radius, network2=None, tol=None,
+                                      confidence=0.95, sample_size=64, replicates=8, seed=None,
+                                      kernel=None):
+    """Estimates the radial distribution distance between two nodes by sampling each frontier
+
+    The sample size per layer is doubled until the confidence interval is
+    no wider than tol on either side, until no layer needs sampling and the
+    value is exact, or until the next round would cost about as much as
+    the exact search, which is then run instead.
+
+    Args:
+        network: a networkx Graph object
+        u: first node
+        v: second node
+        measure: a global measure function, see rdd.crd.is_global_measure
+        radius: the maximum radius we want to compare with
+        network2: Used if node v is from a different graph
+        tol (float): largest accepted half-width of the interval, None to
+            stop after the first round
+        confidence (float): coverage of the interval
+        sample_size (int): nodes expanded per layer in the first round
+        replicates (int): independent searches per ball and round, at least 2
+        seed: seed for numpy.random.default_rng
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        tuple: (estimate, (low, high)) the estimated RDD and its confidence interval
+    """
+    graph = to_csr(network)
+    graph2 = graph if network2 is None else to_csr(network2)
+
+    def exact_value():
+        d = crd_distance(node_crd(graph, u, measure, radius), node_crd(graph2, v, measure, radius),
+                         kernel)
+        return d, (d, d)
+
+    if not is_global_measure(measure):
+        return exact_value()
+
+    rng = np.random.default_rng(seed)
+    replicates = max(2, replicates)
+    t = stats.t.ppf((1 + confidence) / 2, replicates - 1)
+    values1 = global_measure_values(graph, measure)
+    values2 = values1 if graph2 is graph else global_measure_values(graph2, measure)
+    ball1 = _Ball(graph, graph.node_id(u))
+    ball2 = _Ball(graph2, graph2.node_id(v))
+    sample_size = max(2, sample_size)
+    while True:
+        crd1, var1, state1, cost1 = _replicated_crd(ball1, values1, radius, sample_size,
+                                                    replicates, rng)
+        if state1 == 'costly':
+            return exact_value()
+        crd2, var2, state2, cost2 = _replicated_crd(ball2, values2, radius, sample_size,
+                                                    replicates, rng)
+        if state2 == 'costly':
+            return exact_value()
+        estimate = crd_distance(crd1, crd2, kernel)
+        length = max(len(crd1), len(crd2))
+        sd = np.sqrt(pad_crd(var1, length) + pad_crd(var2, length))
+        half = float(t * np.sum(radius_weights(length, kernel) * sd))
+        if tol is None or half <= tol or state1 == state2 == 'exact':
+            return estimate, (max(0.0, estimate - half), estimate + half)
+        # a round at twice the sample reads about twice as much; stop
+        # sampling once the reads so far and the next round's would pass
+        # those of the exact search
+        if 3 * (ball1.work + ball2.work) >= cost1 + cost2:
+            return exact_value()
+        sample_size *= 2
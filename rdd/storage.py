@@ -0,0 +1,116 @@
+"""On-disk RDD matrices.
+
+This module computes an RDD matrix tile by tile and streams the tiles into
+a memory-mapped .npy file, so only the per-node CRDs and one tile are ever
+held in memory. The file can be opened again as a read-only memory map and
+handed to the clustering functions in rdd.other_sims without copying it.
+
+The node order of the rows and columns is stored next to the matrix, in
+path + '.nodes.json', so a file can be checked against the graph it is
+used with.
+"""
+import json
+import numpy as np
+from rdd.crd import crd_matrix, pairwise_rdd
+from rdd.csr import to_csr
+
+
+def node_order_path(path):
+    """Get the file holding the node order of the matrix at path"""
+    return str(path) + '.nodes.json'
+
+
+def _label_json(label):
+    """Encode the NumPy scalars JSON does not know, e.g. labels read with pandas"""
+    if isinstance(label, np.generic):
+        return label.item()
+    raise TypeError(f"node label {label!r} of type {type(label).__name__} "
+                    f"cannot be stored as JSON")
+
+
+def _dump_nodes(nodes):
+    """Encode a node order as JSON, raising TypeError for labels JSON cannot hold"""
+    return json.dumps(list(nodes), default=_label_json)
+
+
+def _as_json(nodes):
+    """Round-trip node labels through JSON, so tuples compare as stored"""
+    return json.loads(_dump_nodes(nodes))
+
+
+def write_rdd_matrix(G, r, measure, path, dtype=np.float64, tile_size=1024, nodes=None,
+                     kernel=None):
+    """Compute the RDD matrix of G in tiles and write it to a .npy file.
+
+    Args:
+        G (Graph): NetworkX Graph
+        r (int): radius
+        measure (function): A measure function
+        path (str): file to write, opened with np.lib.format.open_memmap
+        dtype: dtype stored on disk, np.float32 halves the file size
+        tile_size (int): rows and columns per tile
+        nodes (list): nodes to include, defaults to every node of G
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        list: the node order of the rows and columns in the file, also
+        written to node_order_path(path)
+
+    Raises:
+        TypeError: a node label cannot be stored as JSON, raised before
+            anything is written
+    """
+    graph = to_csr(G)
+    nodes = list(graph.nodes if nodes is None else nodes)
+    order = _dump_nodes(nodes)
+    crds, layers = crd_matrix(graph, measure, r, nodes)
+
+    n = len(nodes)
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(n, n))
+    for row in range(0, n, tile_size):
+        rows = slice(row, row + tile_size)
+        for col in range(0, n, tile_size):
+            cols = slice(col, col + tile_size)
+            out[rows, cols] = pairwise_rdd(crds[rows], layers[rows], crds[cols], layers[cols],
+                                           kernel=kernel)
+        out.flush()
+    del out
+    with open(node_order_path(path), 'w') as f:
+        f.write(order)
+    return nodes
+
+
+def load_rdd_nodes(path):
+    """Get the node order stored with an RDD matrix, labels as decoded from JSON"""
+    with open(node_order_path(path)) as f:
+        return json.load(f)
+
+
+def load_rdd_matrix(path, mode='r', nodes=None):
+    """Open an RDD matrix written by write_rdd_matrix as a memory map.
+
+    Args:
+        path (str): .npy file
+        mode (str): memory map mode, 'r' for read-only
+        nodes (list): expected node order, e.g. list(G); when given the
+            stored order must match it
+
+    Returns:
+        ndarray: np.memmap backed by the file, nothing is read up front
+
+    Raises:
+        ValueError: the file does not hold an RDD matrix over nodes in that order
+    """
+    matrix = np.load(path, mmap_mode=mode)
+    if nodes is not None:
+        expected = _as_json(nodes)
+        if matrix.shape != (len(expected), len(expected)):
+            raise ValueError(f"RDD matrix in {path} has shape {matrix.shape}, "
+                             f"expected {len(expected)} x {len(expected)} nodes")
+        try:
+            stored = load_rdd_nodes(path)
+        except FileNotFoundError:
+            raise ValueError(f"no node order stored for {path}") from None
+        if stored != expected:
+            raise ValueError(f"RDD matrix in {path} was written for a different node order")
+    return matrix
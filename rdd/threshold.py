@@ -0,0 +1,140 @@
+"""Threshold RDD queries.
+
+This module answers "is the RDD between u and v at most eps" without
+always computing the full value. The RDD sum is built one radius at a
+time and stops as soon as the answer is known:
+
+* the partial sum already exceeds eps, since every later term is >= 0;
+* the remaining terms cannot push it past eps. For a non-negative
+  measure both CRDs keep growing but never pass the total measure T of
+  the graph, so every later term is at most w_r * (T - min(crd1, crd2)),
+  where w_r is the kernel weight of radius r (exp(-r) by default).
+
+For global measures (see rdd.crd.is_global_measure) the BFS layers are
+also expanded lazily, so a pair that is decided after two radii only pays
+for two hops. Local measures depend on the whole ball, so their CRDs are
+built in full and only the sum stops early.
+"""
+import numpy as np
+from rdd.crd import global_measure_values, is_global_measure, node_crd, radius_weights
+from rdd.csr import iter_bfs_layers, to_csr
+
+
+def _weights(graph, radius, kernel):
+    """Get the kernel weight of every radius a CRD can have and the sum of those after each
+
+    A ball never has more layers than the graph has nodes, so radius None
+    stops there.
+
+    Returns:
+        tuple: (weights, tails) where tails[r] is the sum of weights[r + 1:]
+    """
+    length = len(graph) if radius is None else min(radius + 1, len(graph))
+    weights = radius_weights(max(length, 1), kernel)
+    tails = np.append(np.cumsum(weights[::-1])[-2::-1], 0.0)
+    return weights, tails
+
+
+def _lazy_crd(graph, u, values, radius):
+    """Yield the CRD of u one radius at a time, searching one hop per value"""
+    total = 0.0
+    for layer in iter_bfs_layers(graph, graph.node_id(u), radius):
+        total += float(values[layer].sum())
+        yield total
+
+
+def _within(crd1, crd2, eps, weights, tails, total):
+    """Decide crd_distance(crd1, crd2) <= eps from two CRD iterators
+
+    weights and tails come from _weights, total is the largest value either
+    CRD can reach, None when unknown.
+    """
+    iters = [iter(crd1), iter(crd2)]
+    last = [0.0, 0.0]
+    partial = 0.0
+    r = 0
+    while True:
+        # a finished CRD keeps its last value, as in ensure_radial_parity
+        live = False
+        for side, it in enumerate(iters):
+            if it is not None:
+                value = next(it, None)
+                if value is None:
+                    iters[side] = None
+                else:
+                    last[side] = value
+                    live = True
+        if not live:
+            return partial <= eps
+        partial += weights[r] * abs(last[0] - last[1])
+        if partial > eps:
+            return False
+        if total is not None:
+            gap = total - min(last)
+            if partial + gap * tails[r] <= eps:
+                return True
+        r += 1
+
+
+def _setup(network, measure, radius, kernel):
+    graph = to_csr(network)
+    weights = _weights(graph, radius, kernel)
+    if not is_global_measure(measure):
+        return graph, weights, None, None
+    values = global_measure_values(graph, measure)
+    total = float(values.sum()) if len(values) and values.min() >= 0 else None
+    return graph, weights, values, total
+
+
+def _crd(graph, u, measure, values, radius):
+    if values is None:
+        return node_crd(graph, u, measure, radius)
+    return _lazy_crd(graph, u, values, radius)
+
+
+def rdd_within(network, u, v, measure, radius, eps, kernel=None):
+    """Check whether the RDD between two nodes is at most eps
+
+    Gives the same answer as realworld_distance_compare(...) <= eps, up to
+    rounding for pairs exactly on the boundary.
+
+    Args:
+        network: a networkx Graph
+        u: label of the first node
+        v: label of the second node
+        measure: a function that returns a list of values representing measures for each node
+        radius: the maximum radius we want to compare with
+        eps (float): largest RDD accepted
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        bool: True if u and v are within eps of each other
+    """
+    graph, (weights, tails), values, total = _setup(network, measure, radius, kernel)
+    return _within(_crd(graph, u, measure, values, radius),
+                   _crd(graph, v, measure, values, radius), eps, weights, tails, total)
+
+
+def rdd_filter(network, u, candidates, measure, radius, eps, kernel=None):
+    """Get the candidates whose RDD to u is at most eps
+
+    The CRD of u is built once and every candidate is screened against it
+    with the same early exits as rdd_within.
+
+    Args:
+        network: a networkx Graph
+        u: label of the node to compare against
+        candidates: labels of the nodes to screen
+        measure: a function that returns a list of values representing measures for each node
+        radius: the maximum radius we want to compare with
+        eps (float): largest RDD accepted
+        kernel: radius weights from rdd.kernels, None for exp(-r)
+
+    Returns:
+        list: the candidates within eps of u, in the order given
+    """
+    graph, (weights, tails), values, total = _setup(network, measure, radius, kernel)
+    crd_u = list(_crd(graph, u, measure, values, radius))
+    return [v for v in candidates
+            if _within(crd_u, _crd(graph, v, measure, values, radius), eps, weights, tails,
+                       total)]
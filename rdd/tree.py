@@ -0,0 +1,125 @@
+"""Measures on BFS trees.
+
+The local_path_* measures in rdd.measures evaluate a measure on the BFS
+tree of the ball around the root. This module computes those measures
+straight from the tree's parent array, without building a graph.
+
+Every function takes parents, where parents[i] is the position of node i's
+parent and -1 marks the root, and returns one value per position. They
+match the NetworkX function of the same name run on the tree, up to
+floating point rounding.
+"""
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from rdd.katz import KATZ_ALPHA, KATZ_BETA, KATZ_TOL, check_alpha, katz_solve, normalize
+
+
+def _edges(parents):
+    """Get (children, parents) position arrays, one entry per tree edge"""
+    children = np.flatnonzero(parents >= 0)
+    return children, parents[children]
+
+
+def tree_degree(parents):
+    """Number of children of each node, plus one for its parent"""
+    children, _ = _edges(parents)
+    return np.bincount(parents[children], minlength=len(parents)) + (parents >= 0)
+
+
+def tree_triangles(parents):
+    """A tree has no triangles"""
+    return np.zeros(len(parents), dtype=np.int64)
+
+
+def tree_cliques(parents):
+    """Number of maximal cliques containing each node
+
+    In a tree every edge is a maximal clique, and a node without edges is
+    a clique of its own.
+    """
+    return np.maximum(tree_degree(parents), 1)
+
+
+def _neighbor_sum(parents, children, ups, values):
+    """Sum values over the tree neighbors of every node"""
+    n = len(parents)
+    return (np.bincount(ups, weights=values[children], minlength=n)
+            + np.bincount(children, weights=values[ups], minlength=n))
+
+
+def tree_adjacency(parents):
+    """Get the symmetric CSR adjacency of the tree"""
+    n = len(parents)
+    children, ups = _edges(parents)
+    ends = np.concatenate((children, ups)), np.concatenate((ups, children))
+    return sparse.csr_matrix((np.ones(2 * len(children)), ends), shape=(n, n))
+
+
+def tree_katz_centrality(parents, alpha=KATZ_ALPHA, beta=KATZ_BETA, x0=None, tol=KATZ_TOL,
+                         normalized=True, checked=False):
+    """Katz centrality of each node, as nx.katz_centrality on the tree
+
+    Solved as a sparse linear system, see rdd.katz. x0 is a starting
+    vector, such as the whole graph's Katz values on the same nodes.
+    checked skips the convergence check when the caller knows alpha is
+    small enough for the tree: a converged solve on an undirected graph
+    bounds the spectral radius of every tree inside it, but not on a
+    directed graph, whose BFS tree is taken as undirected.
+    """
+    adj = tree_adjacency(parents)
+    if not checked:
+        check_alpha(adj, alpha)
+    x = katz_solve(adj, alpha, beta, x0=x0, tol=tol)
+    return normalize(x) if normalized else x
+
+
+def tree_pagerank(parents, alpha=0.85, max_iter=100, tol=1.0e-6):
+    """PageRank of each node, as nx.pagerank on the tree"""
+    n = len(parents)
+    children, ups = _edges(parents)
+    degree = tree_degree(parents)
+    inverse = np.where(degree > 0, 1.0 / np.maximum(degree, 1), 0.0)
+    dangling = degree == 0
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        xlast = x
+        spread = _neighbor_sum(parents, children, ups, xlast * inverse)
+        x = alpha * (spread + xlast[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(x - xlast).sum() < n * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def tree_harmonic_centrality(parents, depths):
+    """Sum of 1 / distance to every other node, as nx.harmonic_centrality on the tree
+
+    Counts the nodes at each distance from every node in two sweeps over
+    the depth levels: first within each subtree, bottom up, then through
+    the parent, top down.
+
+    Args:
+        parents (ndarray): parent positions, -1 for the root
+        depths (ndarray): distance of each node from the root
+    """
+    n = len(parents)
+    height = int(depths.max(initial=0))
+    width = 2 * height + 1
+    levels = [np.flatnonzero(depths == d) for d in range(height + 1)]
+
+    # below[i, k]: nodes k hops under i in its own subtree
+    below = np.zeros((n, width))
+    below[:, 0] = 1
+    for level in reversed(levels[1:]):
+        np.add.at(below[:, 1:], parents[level], below[level, :-1])
+
+    # around[i, k]: nodes k hops from i anywhere in the tree; the ones
+    # reached through the parent are the parent's k - 1 hop counts minus
+    # those back inside i's subtree
+    around = below.copy()
+    for level in levels[1:]:
+        up = np.zeros((len(level), width))
+        up[:, 1:] = around[parents[level], :-1]
+        up[:, 2:] -= below[level, :-2]
+        around[level] += up
+    return around[:, 1:] @ (1.0 / np.arange(1, width))
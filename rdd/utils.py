@@ -5,6 +5,7 @@ from scipy.stats import ks_2samp
 import numpy as np
 import pandas as pd
 from rdd.RDD import realworld_distance_compare
+from rdd.parallel import effective_n_jobs, parallel_rdd_matrix
 
 
 def df_to_cluster_list(df):
@@ -72,15 +73,21 @@ def ecdf(data):
 
 
 # TODO: Is this broken? Use get_rdd_matrix from RDD instead
-def get_df_for_cluster(g, target_G, measure_list, target_rad):
+def get_df_for_cluster(g, target_G, measure_list, target_rad, n_jobs=None):
     """Gets a Matrix of all RDD values to and from all nodes.
 
     Args:
         g (NetworkX Graph): A
+        n_jobs (int): number of processes, -1 for every core (see rdd.parallel)
 
     Returns:
         DataFrame: A matrix of all RDD values to and from all nodes.
     """
+    if effective_n_jobs(n_jobs) > 1:
+        return pd.DataFrame(parallel_rdd_matrix(target_G, target_rad, measure_list,
+                                                nodes=list(g.nodes()), n_jobs=n_jobs).T,
+                            columns=list(g.nodes()))
+
     all_rdds_df = pd.DataFrame()
     for target_one in g.nodes():
         rdd_list = []
@@ -0,0 +1,43 @@
+"""The RDD comparison as it was first written, for the tests to check against.
+
+Full shortest paths from nx.single_source_shortest_path, a node list built
+from them, a CRD dictionary and the exp(-r) sum of rdd_default_scale.
+"""
+import random
+import networkx as nx
+import numpy as np
+from rdd.RDD import (add_measures_to_node, ensure_radial_parity, get_crd, populate_node_list,
+                     rdd_default_scale)
+
+
+def reference_crd(network, u, measure, radius):
+    node_list = populate_node_list(nx.single_source_shortest_path(network, u, radius))
+    add_measures_to_node(node_list, measure(network, node_list))
+    return get_crd(node_list)
+
+
+def reference_rdd(network, u, v, measure, radius, weight=None, network2=None):
+    """RDD between u and v, weight maps a radius to its weight, None for exp(-r)"""
+    crd1 = reference_crd(network, u, measure, radius)
+    crd2 = reference_crd(network if network2 is None else network2, v, measure, radius)
+    ensure_radial_parity(crd1, crd2)
+    rdd = 0
+    for r in range(len(crd1)):
+        if weight is None:
+            rdd = rdd_default_scale(rdd, r, crd1, crd2)
+        else:
+            rdd += weight(r) * abs(crd1[r] - crd2[r])
+    return rdd
+
+
+def reference_matrix(network, measure, radius, weight=None, network2=None):
+    """reference_rdd between every node of network and every node of network2"""
+    other = network if network2 is None else network2
+    return np.array([[reference_rdd(network, u, v, measure, radius, weight, network2)
+                      for v in other] for u in network])
+
+
+def sample_pairs(network, count=20, seed=0):
+    rng = random.Random(seed)
+    nodes = list(network)
+    return [(rng.choice(nodes), rng.choice(nodes)) for _ in range(count)]
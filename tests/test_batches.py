@@ -0,0 +1,72 @@
+"""Checks the batched rows behind get_rdds_for_visuals."""
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+from reference import reference_rdd
+from rdd import measures
+from rdd.RDD import (VISUALS_COLUMNS, BatchSink, get_rdds_for_visuals,
+                     get_rdds_for_visuals_vector, iter_rdds_for_visuals,
+                     iter_rdds_for_visuals_vector, rdd_vector_matrix, visuals_vector_columns)
+
+
+MEASURE_VECTOR = [measures.global_graph_degree, measures.local_graph_degree]
+
+
+@pytest.mark.parametrize('batch_size', [1, 5, 34, 256])
+def test_batches_cover_every_node(batch_size):
+    network = nx.karate_club_graph()
+    measure = measures.global_graph_degree
+    batches = list(iter_rdds_for_visuals(network, 0, measure, 2, batch_size=batch_size))
+    assert all(len(batch) == batch_size for batch in batches[:-1])
+    assert 0 < len(batches[-1]) <= batch_size
+    rows = [row for batch in batches for row in batch]
+    assert [row[0] for row in rows] == list(network)
+    np.testing.assert_allclose([row[1] for row in rows],
+                               [reference_rdd(network, 0, v, measure, 2) for v in network])
+    assert [row[3] for row in rows] == [network.degree(v) for v in network]
+
+
+# u's own row has rdd 0
+@pytest.mark.filterwarnings('ignore:divide by zero')
+def test_visuals_frame_is_the_rescaled_rows():
+    network = nx.karate_club_graph()
+    measure = measures.local_graph_degree
+    rows = [row for batch in iter_rdds_for_visuals(network, 0, measure, 2, batch_size=7)
+            for row in batch]
+    with np.errstate(divide='ignore'):
+        expected = np.tanh(np.log10([row[1] for row in rows]))
+    df = get_rdds_for_visuals(network, 0, measure, 2)
+    assert list(df.columns) == VISUALS_COLUMNS
+    np.testing.assert_allclose(df['rdd'], expected)
+
+
+def test_vector_batches_match_the_matrix():
+    network = nx.karate_club_graph()
+    rdds, norms = rdd_vector_matrix(network, 0, MEASURE_VECTOR, 2)
+    for measure, column in zip(MEASURE_VECTOR, rdds.T):
+        np.testing.assert_allclose(column, [reference_rdd(network, 0, v, measure, 2)
+                                            for v in network])
+    rows = [row for batch in iter_rdds_for_visuals_vector(network, 0, MEASURE_VECTOR, 2,
+                                                           batch_size=4)
+            for row in batch]
+    frame = pd.DataFrame(rows, columns=visuals_vector_columns(MEASURE_VECTOR))
+    np.testing.assert_allclose(frame.iloc[:, 3:5].to_numpy(), rdds)
+    np.testing.assert_allclose(frame['normalized_rdd'], norms)
+    assert len(get_rdds_for_visuals_vector(network, 0, MEASURE_VECTOR, 2)) == len(network)
+
+
+def test_sink_writes_csv(tmp_path):
+    network = nx.karate_club_graph()
+    path = tmp_path / 'rdds.csv'
+    path.write_text('stale\n')
+    batches = list(iter_rdds_for_visuals(network, 0, measures.global_graph_degree, 2,
+                                         batch_size=10))
+    sink = BatchSink(VISUALS_COLUMNS, path=str(path)).consume(iter(batches))
+    assert sink.frame.empty
+    written = pd.read_csv(path)
+    assert list(written.columns) == VISUALS_COLUMNS
+    expected = pd.DataFrame([row for batch in batches for row in batch], columns=VISUALS_COLUMNS)
+    pd.testing.assert_frame_equal(written, expected)
+    kept = BatchSink(VISUALS_COLUMNS, path=str(tmp_path / 'kept.csv'), keep=True)
+    pd.testing.assert_frame_equal(kept.consume(iter(batches)).frame, expected)
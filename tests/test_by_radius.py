@@ -0,0 +1,31 @@
+"""Checks the one-search RDD at every radius against one run per radius."""
+import networkx as nx
+import numpy as np
+from reference import reference_matrix, reference_rdd, sample_pairs
+from rdd import measures
+from rdd.RDD import get_rdd_matrix_by_radius, rdd_by_radius
+
+
+def test_rdd_by_radius_matches_each_radius():
+    network = nx.karate_club_graph()
+    measure = measures.local_graph_degree
+    for u, v in sample_pairs(network, 5):
+        expected = [reference_rdd(network, u, v, measure, r) for r in range(1, 4)]
+        np.testing.assert_allclose(rdd_by_radius(network, u, v, measure, 3), expected)
+
+
+def test_rdd_by_radius_across_graphs():
+    network, other = nx.karate_club_graph(), nx.les_miserables_graph()
+    measure = measures.global_graph_degree
+    expected = [reference_rdd(network, 0, 'Valjean', measure, r, network2=other)
+                for r in range(1, 4)]
+    np.testing.assert_allclose(rdd_by_radius(network, 0, 'Valjean', measure, 3, other), expected)
+
+
+def test_matrix_by_radius_matches_each_radius():
+    network = nx.karate_club_graph()
+    measure = measures.global_graph_triangles
+    by_radius = get_rdd_matrix_by_radius(network, 3, measure, block_size=5)
+    assert by_radius.shape == (3, len(network), len(network))
+    for r in range(1, 4):
+        np.testing.assert_allclose(by_radius[r - 1], reference_matrix(network, measure, r))
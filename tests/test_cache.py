@@ -0,0 +1,68 @@
+"""Checks that per-graph caches never outlive an edit of the graph."""
+import networkx as nx
+import numpy as np
+import pytest
+from rdd import measures
+from rdd.RDD import realworld_distance_compare
+from rdd.cache import cached, graph_version
+from rdd.csr import to_csr
+
+
+def swap_edge(network):
+    # keeps the node and edge counts
+    network.remove_edge(0, 1)
+    network.add_edge(0, 9)
+
+
+def neighbors(graph, node):
+    i = graph.node_id(node)
+    return sorted(graph.nodes[j] for j in graph.indices[graph.indptr[i]:graph.indptr[i + 1]])
+
+
+@pytest.fixture(params=['hook', 'no_hook'])
+def network(request):
+    network = nx.karate_club_graph()
+    if request.param == 'no_hook':
+        # NetworkX < 3.3 has no __networkx_cache__
+        del network.__networkx_cache__
+    return network
+
+
+def test_csr_follows_edits(network):
+    assert neighbors(to_csr(network), 0) == sorted(network[0])
+    swap_edge(network)
+    assert neighbors(to_csr(network), 0) == sorted(network[0])
+
+
+def test_cached_values_follow_edits(network):
+    before = realworld_distance_compare(network, 0, 9, measures.global_graph_pagerank, 2)
+    swap_edge(network)
+    fresh = nx.Graph(network)
+    after = realworld_distance_compare(network, 0, 9, measures.global_graph_pagerank, 2)
+    assert after == pytest.approx(
+        realworld_distance_compare(fresh, 0, 9, measures.global_graph_pagerank, 2))
+    assert after != pytest.approx(before)
+
+
+def test_cache_hits_until_mutated():
+    network = nx.karate_club_graph()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cached(network, 'key', compute) == cached(network, 'key', compute) == 1
+    version = graph_version(network)
+    assert graph_version(network.subgraph([0, 1, 2])) == version
+    network.add_edge(0, 9)
+    assert graph_version(network) != version
+    assert cached(network, 'key', compute) == 2
+
+
+def test_no_hook_never_caches():
+    network = nx.karate_club_graph()
+    del network.__networkx_cache__
+    assert graph_version(network) != graph_version(network)
+    assert cached(network, 'key', object) is not cached(network, 'key', object)
+    np.testing.assert_array_equal(to_csr(network).indices, to_csr(network).indices)
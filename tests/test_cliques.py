@@ -0,0 +1,34 @@
+"""Checks the maximal clique counts against enumerating NetworkX cliques."""
+import networkx as nx
+import pytest
+from rdd import measures
+from rdd.RDD import bfs_node_list
+from rdd.cliques import clique_counts
+
+
+def find_cliques_counts(network):
+    return {node: sum(node in clique for clique in nx.find_cliques(network)) for node in network}
+
+
+@pytest.mark.parametrize('network', [nx.karate_club_graph(), nx.les_miserables_graph(),
+                                     nx.gnp_random_graph(60, 0.2, seed=2)],
+                         ids=['karate', 'les_miserables', 'gnp'])
+def test_clique_counts_match_find_cliques(network):
+    network.add_node('isolated')
+    counts = clique_counts(network)
+    assert list(counts) == list(network)
+    assert counts == find_cliques_counts(network)
+    assert counts['isolated'] == 1
+
+
+@pytest.mark.parametrize('radius', [1, 2])
+def test_clique_measures(radius):
+    network = nx.les_miserables_graph()
+    expected = find_cliques_counts(network)
+    for u in ['Valjean', 'Myriel', 'Gavroche']:
+        node_list = bfs_node_list(network, u, radius)
+        assert measures.global_graph_clique(network, node_list) == \
+            [expected[name] for name in node_list.names]
+        local = find_cliques_counts(network.subgraph(node_list.names))
+        assert measures.local_graph_clique(network, node_list) == \
+            [local[name] for name in node_list.names]
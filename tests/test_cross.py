@@ -0,0 +1,44 @@
+"""Checks the RDD matrix between the nodes of two graphs."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_matrix, reference_rdd
+from rdd import measures
+from rdd.RDD import cross_rdd_matrix
+from rdd.kernels import power_kernel
+
+
+@pytest.mark.parametrize('measure', [measures.global_graph_degree, measures.local_graph_degree,
+                                     measures.global_graph_triangles],
+                         ids=lambda m: m.__name__)
+@pytest.mark.parametrize('radius', [1, 2, None])
+def test_cross_matrix_matches_reference(measure, radius):
+    network, other = nx.karate_club_graph(), nx.florentine_families_graph()
+    matrix = cross_rdd_matrix(network, other, measure, radius, block_size=5)
+    assert list(matrix.index) == list(network)
+    assert list(matrix.columns) == list(other)
+    np.testing.assert_allclose(matrix.to_numpy(),
+                               reference_matrix(network, measure, radius, network2=other))
+
+
+def test_cross_matrix_with_itself_is_the_rdd_matrix():
+    network = nx.karate_club_graph()
+    matrix = cross_rdd_matrix(network, network, measures.local_graph_degree, 2)
+    np.testing.assert_allclose(matrix.to_numpy(),
+                               reference_matrix(network, measures.local_graph_degree, 2))
+
+
+def test_aligned_cross_matrix():
+    network = nx.karate_club_graph()
+    edited = network.copy()
+    edited.remove_nodes_from([3, 20])
+    edited.add_edge(0, 40)
+    kernel = power_kernel(1.0)
+    weights = kernel(len(network))
+    matrix = cross_rdd_matrix(network, edited, measures.global_graph_degree, 2, align=True,
+                              kernel=kernel)
+    shared = [node for node in network if node in edited]
+    assert list(matrix.index) == list(matrix.columns) == shared
+    for node in [0, 1, 33]:
+        assert matrix.loc[node, node] == pytest.approx(reference_rdd(
+            network, node, node, measures.global_graph_degree, 2, lambda r: weights[r], edited))
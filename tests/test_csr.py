@@ -0,0 +1,58 @@
+"""Checks the CSR engine against the original comparison path."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_rdd, sample_pairs
+from rdd import measures
+from rdd.RDD import bfs_distances, bfs_node_list, realworld_distance_compare
+from rdd.crd import csr_realworld_distance_compare
+from rdd.csr import bfs_layers, to_csr
+
+
+MEASURES = [
+    measures.global_graph_degree,
+    measures.local_graph_degree,
+    measures.local_path_degree,
+    measures.global_graph_triangles,
+    measures.local_graph_triangles,
+    measures.global_graph_clique,
+    measures.global_graph_morgan_index,
+]
+
+
+@pytest.mark.parametrize('measure', MEASURES, ids=lambda m: m.__name__)
+@pytest.mark.parametrize('radius', [1, 2, None])
+def test_csr_engine_matches_reference(measure, radius):
+    network = nx.karate_club_graph()
+    for u, v in sample_pairs(network):
+        expected = reference_rdd(network, u, v, measure, radius)
+        assert realworld_distance_compare(network, u, v, measure, radius) == \
+            pytest.approx(expected)
+        assert csr_realworld_distance_compare(network, u, v, measure, radius) == \
+            pytest.approx(expected)
+
+
+def test_csr_engine_across_graphs():
+    network, other = nx.karate_club_graph(), nx.les_miserables_graph()
+    measure = measures.local_graph_degree
+    expected = reference_rdd(network, 0, 'Valjean', measure, 2, network2=other)
+    assert csr_realworld_distance_compare(network, 0, 'Valjean', measure, 2, other) == \
+        pytest.approx(expected)
+    assert realworld_distance_compare(network, 0, 'Valjean', measure, 2, other) == \
+        pytest.approx(expected)
+
+
+@pytest.mark.parametrize('network', [nx.les_miserables_graph(),
+                                     nx.gnp_random_graph(50, 0.05, seed=1, directed=True)],
+                         ids=['labels', 'directed'])
+def test_bfs_matches_shortest_paths(network):
+    graph = to_csr(network)
+    for u in list(network)[:10]:
+        for radius in (0, 1, 3, None):
+            expected = nx.single_source_shortest_path_length(network, u, radius)
+            assert bfs_distances(network, u, radius) == expected
+            order, dist = bfs_layers(graph, graph.node_id(u), radius)
+            assert {graph.nodes[i]: d for i, d in zip(order, dist)} == expected
+            node_list = bfs_node_list(network, u, radius)
+            assert dict(zip(node_list.names, node_list.radii.tolist())) == expected
+            np.testing.assert_array_equal(np.diff(dist) >= 0, True)
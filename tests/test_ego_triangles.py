@@ -0,0 +1,54 @@
+"""Checks the ego graph triangle table against local_graph_triangles."""
+import networkx as nx
+import pytest
+from rdd import measures
+from rdd.RDD import bfs_node_list, realworld_distance_compare
+from rdd.ego_triangles import triangle_table_measure
+
+
+@pytest.fixture
+def network():
+    # a small component, so some balls stop short of the radius
+    return nx.disjoint_union(nx.les_miserables_graph(), nx.complete_graph(4))
+
+
+@pytest.mark.parametrize('radius', [1, 2, 3, None])
+@pytest.mark.parametrize('batch_size', [1, 16, 256])
+def test_table_matches_local_triangles(network, radius, batch_size):
+    measure = triangle_table_measure(network, radius, batch_size=batch_size)
+    for u in network:
+        node_list = bfs_node_list(network, u, radius)
+        expected = nx.triangles(network.subgraph(node_list.names))
+        assert measure(network, node_list) == [expected[name] for name in node_list.names]
+
+
+def test_roots_outside_the_table(network):
+    roots = list(network)[:5]
+    measure = triangle_table_measure(network, 2, roots=roots)
+    for u in list(network)[:10]:
+        for radius in (1, 2):
+            node_list = bfs_node_list(network, u, radius)
+            assert measure(network, node_list) == \
+                measures.local_graph_triangles(network, node_list)
+
+
+def test_table_after_mutation():
+    network = nx.karate_club_graph()
+    measure = triangle_table_measure(network, 2)
+    for v in [1, 33]:
+        assert realworld_distance_compare(network, 0, v, measure, 2) == \
+            realworld_distance_compare(network, 0, v, measures.local_graph_triangles, 2)
+    network.add_edge(0, 33)
+    network.add_edge(0, 32)
+    for v in [1, 33]:
+        assert realworld_distance_compare(network, 0, v, measure, 2) == \
+            realworld_distance_compare(network, 0, v, measures.local_graph_triangles, 2)
+
+
+def test_table_on_another_graph():
+    network = nx.karate_club_graph()
+    other = nx.karate_club_graph()
+    other.add_edge(0, 33)
+    measure = triangle_table_measure(network, 2)
+    node_list = bfs_node_list(other, 0, 2)
+    assert measure(other, node_list) == measures.local_graph_triangles(other, node_list)
@@ -0,0 +1,69 @@
+"""Checks the batched harmonic centrality against NetworkX."""
+import networkx as nx
+import numpy as np
+import pytest
+from rdd import measures
+from rdd.RDD import bfs_node_list
+from rdd.harmonic import (_ENTRY_BYTES, FRONTIER_BYTES, approx_harmonic_centrality, frontier_batch,
+                          harmonic_centrality, harmonic_measure)
+
+
+NETWORKS = [nx.les_miserables_graph(),
+            nx.disjoint_union(nx.karate_club_graph(), nx.path_graph(5)),
+            nx.gnp_random_graph(80, 0.04, seed=4, directed=True)]
+
+
+@pytest.mark.parametrize('network', NETWORKS, ids=['labels', 'components', 'directed'])
+@pytest.mark.parametrize('batch_size', [1, 7, 256])
+def test_harmonic_matches_networkx(network, batch_size):
+    values = harmonic_centrality(network, batch_size=batch_size)
+    expected = nx.harmonic_centrality(network)
+    assert list(values) == list(network)
+    np.testing.assert_allclose([values[node] for node in network],
+                               [expected[node] for node in network])
+
+
+@pytest.mark.parametrize('radius', [1, 2, 3])
+def test_harmonic_measures(radius):
+    network = nx.les_miserables_graph()
+    expected = nx.harmonic_centrality(network)
+    for u in ['Valjean', 'Myriel', 'Gavroche']:
+        node_list = bfs_node_list(network, u, radius)
+        np.testing.assert_allclose(measures.global_graph_harmonic_centrality(network, node_list),
+                                   [expected[name] for name in node_list.names])
+        local = nx.harmonic_centrality(network.subgraph(node_list.names))
+        np.testing.assert_allclose(measures.local_graph_harmonic_centrality(network, node_list),
+                                   [local[name] for name in node_list.names])
+
+
+def test_approx_with_every_pivot_is_exact():
+    network = nx.karate_club_graph()
+    assert approx_harmonic_centrality(network, samples=len(network)) == \
+        pytest.approx(nx.harmonic_centrality(network))
+
+
+def test_approx_is_unbiased():
+    network = nx.karate_club_graph()
+    runs = np.array([list(approx_harmonic_centrality(network, samples=8, seed=seed).values())
+                     for seed in range(400)])
+    expected = np.array([nx.harmonic_centrality(network)[node] for node in network])
+    error = np.abs(runs.mean(axis=0) - expected)
+    assert np.all(error <= 4 * runs.std(axis=0, ddof=1) / np.sqrt(len(runs)) + 1e-9)
+
+
+def test_harmonic_measure_shares_one_sample():
+    network = nx.karate_club_graph()
+    measure = harmonic_measure(samples=8, seed=1)
+    node_list = bfs_node_list(network, 0, 2)
+    assert measure(network, node_list) == measure(network, node_list)
+    estimate = approx_harmonic_centrality(network, samples=8, seed=1)
+    assert measure(network, node_list) == [estimate[name] for name in node_list.names]
+
+
+def test_frontier_batch_bounds():
+    assert frontier_batch(100, 256) == 256
+    assert frontier_batch(0, 5) == 5
+    assert frontier_batch(FRONTIER_BYTES, 256) == 1
+    n = 10 ** 6
+    assert 1 < frontier_batch(n, 256) < 256
+    assert frontier_batch(n, 256) * n * _ENTRY_BYTES <= FRONTIER_BYTES
@@ -0,0 +1,74 @@
+"""Checks IncrementalRDD against a full recompute after random edge diffs."""
+import random
+import networkx as nx
+import numpy as np
+import pytest
+from rdd import measures
+from rdd.crd import crd_matrix, pairwise_rdd
+from rdd.csr import to_csr
+from rdd.incremental import IncrementalRDD, edge_diff
+from rdd.kernels import power_kernel
+
+
+MEASURES = [
+    measures.global_graph_degree,
+    measures.global_graph_triangles,
+    measures.local_graph_degree,
+    measures.local_path_degree,
+    measures.global_graph_pagerank,
+]
+
+
+def full_recompute(network, measure, radius, kernel=None):
+    crds, layers = crd_matrix(to_csr(network), measure, radius)
+    return pairwise_rdd(crds, layers, kernel=kernel)
+
+
+def random_diff(network, rng, size):
+    nodes = list(network)
+    edges = list(network.edges())
+    removed = rng.sample(edges, size)
+    added = []
+    while len(added) < size:
+        u, v = rng.sample(nodes, 2)
+        if not network.has_edge(u, v) and (u, v) not in added and (v, u) not in added:
+            added.append((u, v))
+    return added, removed
+
+
+@pytest.mark.parametrize('measure', MEASURES, ids=lambda m: m.__name__)
+@pytest.mark.parametrize('radius', [1, 2])
+def test_random_diffs_match_full_recompute(measure, radius):
+    rng = random.Random(radius)
+    network = nx.karate_club_graph()
+    incremental = IncrementalRDD(network, measure, radius)
+    for _ in range(4):
+        added, removed = random_diff(network, rng, 3)
+        incremental.update(added, removed)
+        assert incremental.nodes == list(network)
+        np.testing.assert_allclose(incremental.rdd, full_recompute(network, measure, radius))
+
+
+def test_edge_diff_between_snapshots():
+    rng = random.Random(7)
+    old = nx.gnm_random_graph(60, 150, seed=3)
+    new = old.copy()
+    added, removed = random_diff(new, rng, 5)
+    new.add_edges_from(added)
+    new.remove_edges_from(removed)
+
+    incremental = IncrementalRDD(old.copy(), measures.global_graph_triangles, 2)
+    incremental.update(*edge_diff(old, new))
+    np.testing.assert_allclose(incremental.rdd,
+                               full_recompute(new, measures.global_graph_triangles, 2))
+
+
+def test_new_nodes_and_kernel():
+    kernel = power_kernel(0.5)
+    network = nx.path_graph(10)
+    incremental = IncrementalRDD(network, measures.local_graph_degree, 2, kernel=kernel)
+    changed = incremental.update(added=[(9, 10), (10, 11), (0, 5)], removed=[(2, 3)])
+    assert 11 in changed
+    assert incremental.nodes == list(network)
+    np.testing.assert_allclose(incremental.rdd,
+                               full_recompute(network, measures.local_graph_degree, 2, kernel))
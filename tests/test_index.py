@@ -0,0 +1,57 @@
+"""Checks RDDIndex queries against comparing every pair."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_matrix
+from rdd import measures
+from rdd.crd import crd_matrix, pairwise_rdd
+from rdd.csr import to_csr
+from rdd.index import RDDIndex
+
+
+def brute_force(network, measure, radius):
+    crds, layers = crd_matrix(to_csr(network), measure, radius)
+    return pairwise_rdd(crds, layers)
+
+
+def test_index_distances_match_reference():
+    network = nx.karate_club_graph()
+    measure = measures.global_graph_degree
+    index = RDDIndex(network, measure, 2)
+    expected = reference_matrix(network, measure, 2)
+    for i in range(len(network)):
+        np.testing.assert_allclose(index.distances(index.crds[i], np.arange(len(network))),
+                                   expected[i])
+
+
+@pytest.mark.parametrize('leaf_size', [1, 4, 16])
+def test_knn_matches_brute_force(leaf_size):
+    network = nx.barabasi_albert_graph(300, 2, seed=3)
+    measure = measures.local_graph_degree
+    index = RDDIndex(network, measure, 2, leaf_size=leaf_size)
+    expected = brute_force(network, measure, 2)
+    for u in [0, 7, 150, 299]:
+        for k in [0, 1, 5, 40, 300]:
+            found = index.knn(u, k)
+            assert len(found) == k
+            dists = [d for _, d in found]
+            assert dists == sorted(dists)
+            np.testing.assert_allclose(dists, np.sort(expected[u])[:k], atol=1e-9)
+            np.testing.assert_allclose([expected[u, v] for v, _ in found], dists, atol=1e-9)
+
+
+@pytest.mark.parametrize('leaf_size', [1, 4, 16])
+def test_range_matches_brute_force(leaf_size):
+    network = nx.barabasi_albert_graph(300, 2, seed=3)
+    measure = measures.global_graph_triangles
+    index = RDDIndex(network, measure, 2, leaf_size=leaf_size)
+    expected = brute_force(network, measure, 2)
+    for u in [0, 7, 150, 299]:
+        values = np.unique(expected[u])
+        # halfway between two distinct values, away from rounding at the boundary
+        for eps in (values[:-1] + np.diff(values) / 2)[[0, len(values) // 4, len(values) // 2]]:
+            found = index.range(u, eps)
+            assert {v for v, _ in found} == set(np.flatnonzero(expected[u] <= eps).tolist())
+            np.testing.assert_allclose([d for _, d in found],
+                                       [expected[u, v] for v, _ in found], atol=1e-9)
+        assert index.range(u, -1.0) == []
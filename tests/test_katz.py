@@ -0,0 +1,68 @@
+"""Checks the sparse Katz solves against nx.katz_centrality."""
+import networkx as nx
+import numpy as np
+import pytest
+from rdd import measures
+from rdd.RDD import bfs_node_list, bfs_tree_graph, node_names
+from rdd.katz import global_katz, katz_centrality, katz_table_measure, warm_start
+from rdd.crd import crd_matrix
+from rdd.csr import to_csr
+
+
+def assert_matches(values, expected, names):
+    np.testing.assert_allclose(values, [expected[name] for name in names], rtol=1e-5)
+
+
+@pytest.mark.parametrize('network', [nx.karate_club_graph(),
+                                     nx.gnp_random_graph(60, 0.05, seed=2, directed=True)],
+                         ids=['undirected', 'directed'])
+def test_katz_centrality_matches_networkx(network):
+    expected = nx.katz_centrality(network, tol=1e-12, max_iter=10000)
+    values = katz_centrality(network)
+    assert_matches([values[node] for node in network], expected, list(network))
+
+
+@pytest.mark.parametrize('network', [nx.karate_club_graph(),
+                                     nx.gnp_random_graph(60, 0.05, seed=2, directed=True)],
+                         ids=['undirected', 'directed'])
+def test_local_katz_measures_match_networkx(network):
+    for u in list(network)[:8]:
+        node_list = bfs_node_list(network, u, 2)
+        names = node_names(node_list)
+        ego = nx.katz_centrality(network.subgraph(names), tol=1e-12, max_iter=10000)
+        assert_matches(measures.local_graph_katz_centrality(network, node_list), ego, names)
+        tree = nx.katz_centrality(bfs_tree_graph(network, u, 2), tol=1e-12, max_iter=10000)
+        assert_matches(measures.local_path_katz_centrality(network, node_list), tree, names)
+
+
+def test_directed_star_tree_raises_like_networkx():
+    # the directed star converges, its BFS tree is the undirected star
+    # with spectral radius sqrt(150), too large for alpha = 0.1
+    star = nx.DiGraph((0, leaf) for leaf in range(1, 151))
+    node_list = bfs_node_list(star, 0, 1)
+    measures.global_graph_katz_centrality(star, node_list)
+    with pytest.raises(nx.PowerIterationFailedConvergence):
+        nx.katz_centrality(bfs_tree_graph(star, 0, 1))
+    with pytest.raises(nx.PowerIterationFailedConvergence):
+        measures.local_path_katz_centrality(star, node_list)
+
+
+def test_failed_global_solve_is_cached_and_raises():
+    star = nx.star_graph(150)
+    for _ in range(2):
+        with pytest.raises(nx.PowerIterationFailedConvergence):
+            global_katz(star)
+        assert warm_start(star, np.arange(3)) is None
+
+
+def test_katz_table_matches_measure_until_mutated():
+    network = nx.karate_club_graph()
+    table = katz_table_measure(network, 2)
+    graph = to_csr(network)
+    np.testing.assert_allclose(crd_matrix(graph, table, 2)[0],
+                               crd_matrix(graph, measures.local_graph_katz_centrality, 2)[0])
+    network.add_edge(0, 33)
+    network.add_edge(16, 25)
+    graph = to_csr(network)
+    np.testing.assert_allclose(crd_matrix(graph, table, 2)[0],
+                               crd_matrix(graph, measures.local_graph_katz_centrality, 2)[0])
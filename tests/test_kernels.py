@@ -0,0 +1,84 @@
+"""Checks the radius kernels of rdd.kernels in every comparison path."""
+import math
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_crd, reference_matrix, reference_rdd, sample_pairs
+from rdd import measures
+from rdd.RDD import (ensure_radial_parity, get_rdd, iter_rdds_for_visuals, rdd_vector_matrix,
+                     realworld_distance_compare)
+from rdd.crd import crd_matrix, csr_realworld_distance_compare, pairwise_rdd
+from rdd.csr import to_csr
+from rdd.incremental import IncrementalRDD
+from rdd.kernels import exp_kernel, power_kernel, uniform_kernel
+from rdd.sampling import approx_realworld_distance_compare
+from rdd.storage import load_rdd_matrix, write_rdd_matrix
+from rdd.threshold import rdd_filter
+
+
+KERNELS = [exp_kernel(0.5), power_kernel(1.0), uniform_kernel()]
+
+
+@pytest.fixture
+def karate():
+    return nx.karate_club_graph()
+
+
+def test_default_kernel_is_rdd_default_scale(karate):
+    measure = measures.global_graph_degree
+    for u, v in sample_pairs(karate, 5):
+        crd1, crd2 = reference_crd(karate, u, measure, 3), reference_crd(karate, v, measure, 3)
+        ensure_radial_parity(crd1, crd2)
+        assert get_rdd(crd1, crd2) == pytest.approx(reference_rdd(karate, u, v, measure, 3))
+
+
+def test_exp_kernel_rate_one_is_default():
+    np.testing.assert_allclose(exp_kernel()(6), [math.exp(-r) for r in range(6)])
+
+
+@pytest.mark.parametrize('kernel', KERNELS, ids=['exp', 'power', 'uniform'])
+def test_kernels_match_weighted_sum(karate, kernel):
+    measure = measures.local_graph_degree
+    weights = kernel(len(karate))
+    for u, v in sample_pairs(karate, 10):
+        expected = reference_rdd(karate, u, v, measure, 3, weight=lambda r: weights[r])
+        assert realworld_distance_compare(karate, u, v, measure, 3, kernel=kernel) == \
+            pytest.approx(expected)
+        assert csr_realworld_distance_compare(karate, u, v, measure, 3, kernel=kernel) == \
+            pytest.approx(expected)
+    crds, layers = crd_matrix(to_csr(karate), measure, 3)
+    expected = reference_matrix(karate, measure, 3, weight=lambda r: weights[r])
+    np.testing.assert_allclose(pairwise_rdd(crds, layers, block_size=6, kernel=kernel), expected)
+
+
+@pytest.mark.parametrize('kernel', KERNELS, ids=['exp', 'power', 'uniform'])
+def test_kernel_reaches_every_entry_point(karate, kernel, tmp_path):
+    measure = measures.global_graph_degree
+    weights = kernel(len(karate))
+    expected = reference_matrix(karate, measure, 2, weight=lambda r: weights[r])
+    nodes = list(karate)
+
+    rows = [row for batch in iter_rdds_for_visuals(karate, 0, measure, 2, kernel=kernel)
+            for row in batch]
+    np.testing.assert_allclose([row[1] for row in rows], expected[0])
+    rdds, _ = rdd_vector_matrix(karate, 0, [measure], 2, kernel=kernel)
+    np.testing.assert_allclose(rdds[:, 0], expected[0])
+
+    eps = np.median(expected[0])
+    assert rdd_filter(karate, 0, nodes, measure, 2, eps, kernel=kernel) == \
+        [v for v, rdd in zip(nodes, expected[0]) if rdd <= eps]
+
+    path = str(tmp_path / 'rdd.npy')
+    write_rdd_matrix(karate, 2, measure, path, tile_size=7, kernel=kernel)
+    np.testing.assert_allclose(load_rdd_matrix(path, nodes=nodes), expected)
+
+    estimate, _ = approx_realworld_distance_compare(karate, 0, 33, measure, 2,
+                                                    sample_size=len(karate), kernel=kernel)
+    assert estimate == pytest.approx(expected[0, 33])
+
+    incremental = IncrementalRDD(karate.copy(), measure, 2, kernel=kernel)
+    incremental.update(added=[(0, 20)], removed=[(0, 1)])
+    karate.add_edge(0, 20)
+    karate.remove_edge(0, 1)
+    np.testing.assert_allclose(incremental.rdd,
+                               reference_matrix(karate, measure, 2, weight=lambda r: weights[r]))
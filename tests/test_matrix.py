@@ -0,0 +1,39 @@
+"""Checks the vectorized RDD matrix against the pairwise comparison."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_crd, reference_matrix
+from rdd import measures
+from rdd.RDD import get_rdd_matrix
+from rdd.crd import crd_matrix, pairwise_rdd
+from rdd.csr import to_csr
+
+
+@pytest.mark.parametrize('measure', [measures.global_graph_degree, measures.local_graph_degree],
+                         ids=lambda m: m.__name__)
+def test_matrix_modes_match_reference(measure):
+    network = nx.karate_club_graph()
+    expected = reference_matrix(network, measure, 2)
+    loop = get_rdd_matrix(network, 2, measure).to_numpy()
+    vectorized = get_rdd_matrix(network, 2, measure, vectorized=True, block_size=5).to_numpy()
+    np.testing.assert_allclose(loop, expected)
+    np.testing.assert_allclose(vectorized, expected)
+
+
+def test_crd_rows_match_reference_crds():
+    # two components, so the CRDs have different lengths
+    network = nx.disjoint_union(nx.path_graph(7), nx.star_graph(4))
+    crds, layers = crd_matrix(to_csr(network), measures.global_graph_degree, None)
+    for i, node in enumerate(network):
+        crd = reference_crd(network, node, measures.global_graph_degree, None)
+        assert layers[i] == len(crd)
+        np.testing.assert_allclose(crds[i, :layers[i]], [crd[r] for r in range(len(crd))])
+        np.testing.assert_allclose(crds[i, layers[i]:], crd[len(crd) - 1])
+
+
+@pytest.mark.parametrize('block_size', [1, 3, 64])
+def test_pairwise_rdd_block_sizes(block_size):
+    network = nx.disjoint_union(nx.path_graph(7), nx.star_graph(4))
+    crds, layers = crd_matrix(to_csr(network), measures.global_graph_degree, None)
+    np.testing.assert_allclose(pairwise_rdd(crds, layers, block_size=block_size),
+                               reference_matrix(network, measures.global_graph_degree, None))
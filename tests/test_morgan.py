@@ -0,0 +1,33 @@
+"""Checks the sparse Morgan index against the neighbour-sum loop."""
+import networkx as nx
+import pytest
+from rdd import measures
+from rdd.RDD import populate_node_list
+from rdd.morgan import morgan_iterations
+
+
+@pytest.fixture
+def karate():
+    return nx.karate_club_graph()
+
+
+def morgan_loop(network, iterations):
+    values = {node: 1 for node in network}
+    for _ in range(iterations - 1):
+        values = {node: sum(values[nbr] for nbr in network.neighbors(node)) for node in network}
+    return [values[node] for node in network]
+
+
+@pytest.mark.parametrize('iterations', [1, 2, 8, 30])
+def test_morgan_iterations_match_the_loop(karate, iterations):
+    values = morgan_iterations(karate, iterations)
+    assert len(values) == iterations
+    for k in range(1, iterations + 1):
+        assert values[k - 1].tolist() == morgan_loop(karate, k)
+
+
+def test_morgan_index_measure(karate):
+    node_list = populate_node_list(nx.single_source_shortest_path(karate, 0, 2))
+    expected = dict(zip(karate, morgan_loop(karate, 8)))
+    assert measures.global_graph_morgan_index(karate, node_list) == \
+        [expected[name] for name in node_list.names]
@@ -0,0 +1,29 @@
+"""Checks the process pool RDD matrix against the serial one."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_matrix
+from rdd import measures
+from rdd.RDD import get_rdd_matrix
+from rdd.crd import crd_matrix, pairwise_rdd
+from rdd.csr import to_csr
+from rdd.parallel import parallel_rdd_matrix
+
+
+@pytest.mark.parametrize('measure', [measures.global_graph_triangles, measures.local_path_degree],
+                         ids=lambda m: m.__name__)
+def test_parallel_matrix_matches_serial(measure):
+    network = nx.karate_club_graph()
+    crds, layers = crd_matrix(to_csr(network), measure, 2)
+    serial = pairwise_rdd(crds, layers)
+    parallel = parallel_rdd_matrix(network, 2, measure, n_jobs=2, block_size=4)
+    np.testing.assert_array_equal(parallel, serial)
+    np.testing.assert_allclose(serial, reference_matrix(network, measure, 2))
+
+
+def test_rdd_matrix_n_jobs():
+    network = nx.karate_club_graph()
+    measure = measures.local_graph_degree
+    parallel = get_rdd_matrix(network, 2, measure, n_jobs=2)
+    assert list(parallel.columns) == list(network)
+    np.testing.assert_allclose(parallel.to_numpy(), get_rdd_matrix(network, 2, measure).to_numpy())
@@ -0,0 +1,43 @@
+"""Checks forward-push PageRank against nx.pagerank."""
+import networkx as nx
+import numpy as np
+import pytest
+from rdd import measures
+from rdd.RDD import bfs_node_list, node_names, realworld_distance_compare
+from rdd.push import pagerank_measure, push_pagerank
+
+
+GRAPHS = [nx.karate_club_graph(), nx.les_miserables_graph(),
+          nx.gnp_random_graph(80, 0.05, seed=2, directed=True)]
+
+
+@pytest.mark.parametrize('network', GRAPHS, ids=['karate', 'les_miserables', 'directed'])
+@pytest.mark.parametrize('path', [False, True], ids=['graph', 'path'])
+def test_pagerank_measure_matches_networkx(network, path):
+    measure = pagerank_measure(path=path)
+    reference = measures.local_path_pagerank if path else measures.local_graph_pagerank
+    for u in list(network)[:6]:
+        for radius in (1, 2):
+            node_list = bfs_node_list(network, u, radius)
+            np.testing.assert_allclose(measure(network, node_list), reference(network, node_list),
+                                       atol=1e-4)
+
+
+@pytest.mark.parametrize('tol', [1e-6, 1e-3, 1e-1])
+def test_dense_ball_is_not_empty(tol):
+    # 1 / n is below tol times the degree of every node of a large clique
+    network = nx.complete_graph(400)
+    network.add_edge(0, 'leaf')
+    measure = pagerank_measure(tol=tol)
+    node_list = bfs_node_list(network, 1, 1)
+    values = np.array(measure(network, node_list))
+    assert np.isfinite(values).all()
+    expected = nx.pagerank(network.subgraph(node_names(node_list)))
+    np.testing.assert_allclose(values, [expected[name] for name in node_names(node_list)],
+                               rtol=1e-2)
+    assert np.isfinite(realworld_distance_compare(network, 0, 'leaf', measure, 1))
+
+
+def test_push_pagerank_without_edges():
+    adj = np.zeros((3, 3))
+    np.testing.assert_allclose(push_pagerank(adj), [1 / 3] * 3)
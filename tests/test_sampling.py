@@ -0,0 +1,69 @@
+"""Checks the sampled RDD estimate and its interval against the exact RDD."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_rdd
+from rdd import measures
+from rdd.crd import csr_realworld_distance_compare, global_measure_values, node_crd
+from rdd.csr import to_csr
+from rdd.sampling import _Ball, _sampled_crd, approx_realworld_distance_compare
+
+
+@pytest.fixture(scope='module')
+def large():
+    return nx.barabasi_albert_graph(4000, 3, seed=1)
+
+
+@pytest.mark.parametrize('measure', [measures.global_graph_degree, measures.local_graph_degree],
+                         ids=lambda m: m.__name__)
+@pytest.mark.parametrize('radius', [2, None])
+def test_small_graphs_are_exact(measure, radius):
+    network = nx.karate_club_graph()
+    for u, v in [(0, 33), (5, 16)]:
+        expected = reference_rdd(network, u, v, measure, radius)
+        estimate, (low, high) = approx_realworld_distance_compare(
+            network, u, v, measure, radius, sample_size=len(network), seed=0)
+        assert estimate == pytest.approx(expected)
+        assert low == high == estimate
+
+
+def test_local_measures_are_exact(large):
+    measure = measures.local_graph_degree
+    expected = csr_realworld_distance_compare(large, 0, 1, measure, 2)
+    assert approx_realworld_distance_compare(large, 0, 1, measure, 2, sample_size=4, seed=0) == \
+        (expected, (expected, expected))
+
+
+def test_sampled_crd_is_unbiased(large):
+    graph = to_csr(large)
+    values = global_measure_values(graph, measures.global_graph_degree)
+    rng = np.random.default_rng(0)
+    for u in [0, 5]:
+        ball = _Ball(graph, graph.node_id(u))
+        runs = np.array([_sampled_crd(ball, values, 3, 32, rng)[0] for _ in range(200)])
+        assert not _sampled_crd(ball, values, 3, 32, rng)[1]
+        expected = node_crd(graph, u, measures.global_graph_degree, 3)
+        error = np.abs(runs.mean(axis=0) - expected)
+        assert np.all(error <= 4 * runs.std(axis=0, ddof=1) / np.sqrt(len(runs)) + 1e-9)
+
+
+def test_interval_covers_the_exact_value(large):
+    measure = measures.global_graph_degree
+    for u, v in [(0, 1), (5, 3000)]:
+        expected = csr_realworld_distance_compare(large, u, v, measure, 3)
+        covered = 0
+        for seed in range(20):
+            estimate, (low, high) = approx_realworld_distance_compare(
+                large, u, v, measure, 3, sample_size=32, seed=seed)
+            assert low < estimate < high
+            covered += low <= expected <= high
+        assert covered >= 16
+
+
+def test_tight_tol_falls_back_to_exact(large):
+    measure = measures.global_graph_degree
+    expected = csr_realworld_distance_compare(large, 0, 1, measure, 3)
+    estimate, (low, high) = approx_realworld_distance_compare(large, 0, 1, measure, 3, tol=1e-6,
+                                                              sample_size=32, seed=0)
+    assert estimate == pytest.approx(expected)
+    assert low == high == estimate
@@ -0,0 +1,71 @@
+"""Checks the pruned sparse RDD matrix against the dense one."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_matrix
+from rdd import measures
+from rdd.RDD import get_rdd_matrix, get_sparse_rdd_matrix
+
+
+@pytest.fixture
+def network():
+    # two components, so the CRDs end at different radii
+    return nx.disjoint_union(nx.karate_club_graph(), nx.path_graph(6))
+
+
+def stored(matrix):
+    coo = matrix.tocoo()
+    return {(i, j): d for i, j, d in zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist())}
+
+
+@pytest.mark.parametrize('radius', [2, None])
+@pytest.mark.parametrize('block_size', [1, 7, 64])
+def test_threshold_keeps_the_small_entries(network, radius, block_size):
+    measure = measures.global_graph_degree
+    dense = reference_matrix(network, measure, radius)
+    threshold = float(np.quantile(dense, 0.2))
+    kept = stored(get_sparse_rdd_matrix(network, radius, measure, threshold=threshold,
+                                        block_size=block_size))
+    expected = {(i, j) for i, j in zip(*np.nonzero(dense <= threshold))}
+    # pairs right at the threshold may go either way after rounding
+    near = {(i, j) for i, j in zip(*np.nonzero(np.isclose(dense, threshold)))}
+    assert expected - near <= set(kept) <= expected | near
+    assert all((i, i) in kept for i in range(len(network)))
+    for (i, j), d in kept.items():
+        assert d == pytest.approx(dense[i, j], abs=1e-9)
+
+
+@pytest.mark.parametrize('k', [1, 3, 10])
+def test_k_keeps_the_nearest(network, k):
+    measure = measures.local_graph_degree
+    dense = reference_matrix(network, measure, 2)
+    matrix = get_sparse_rdd_matrix(network, 2, measure, k=k)
+    assert matrix.getnnz(axis=1).tolist() == [k] * len(network)
+    for i in range(len(network)):
+        row = matrix.getrow(i)
+        np.testing.assert_allclose(np.sort(row.data), np.sort(dense[i])[:k], atol=1e-9)
+        np.testing.assert_allclose(row.data, dense[i, row.indices], atol=1e-9)
+
+
+def test_threshold_and_k(network):
+    measure = measures.global_graph_triangles
+    dense = reference_matrix(network, measure, 2)
+    threshold = float(np.quantile(dense, 0.05))
+    kept = stored(get_sparse_rdd_matrix(network, 2, measure, threshold=threshold, k=4))
+    for i in range(len(network)):
+        row = [d for (a, _), d in kept.items() if a == i]
+        assert len(row) == min(4, int(np.sum(dense[i] <= threshold + 1e-9)))
+        assert all(d <= threshold + 1e-9 for d in row)
+
+
+def test_no_pruning_is_the_dense_matrix():
+    network = nx.karate_club_graph()
+    measure = measures.global_graph_degree
+    dense = get_rdd_matrix(network, 2, measure).to_numpy()
+    np.testing.assert_allclose(get_sparse_rdd_matrix(network, 2, measure).toarray(), dense)
+    edges = get_sparse_rdd_matrix(network, 2, measure, threshold=0.5, edge_list=True)
+    nodes = list(network)
+    assert edges
+    for u, v, d in edges:
+        assert d <= 0.5
+        assert d == pytest.approx(dense[nodes.index(u), nodes.index(v)])
@@ -0,0 +1,48 @@
+"""Checks RDD matrices written to disk by rdd.storage."""
+import os
+import networkx as nx
+import numpy as np
+import pytest
+from rdd import measures
+from rdd.RDD import get_rdd_matrix
+from rdd.storage import load_rdd_matrix, load_rdd_nodes, node_order_path, write_rdd_matrix
+
+
+def test_stored_matrix_matches_rdd_matrix(tmp_path):
+    network = nx.karate_club_graph()
+    path = str(tmp_path / 'rdd.npy')
+    measure = measures.global_graph_degree
+    assert write_rdd_matrix(network, 2, measure, path, tile_size=7) == list(network)
+    stored = load_rdd_matrix(path, nodes=list(network))
+    np.testing.assert_allclose(stored, get_rdd_matrix(network, 2, measure).to_numpy())
+    with pytest.raises(ValueError):
+        load_rdd_matrix(path, nodes=list(reversed(list(network))))
+    with pytest.raises(ValueError):
+        load_rdd_matrix(path, nodes=list(network)[:-1])
+
+
+def test_missing_node_order_is_rejected(tmp_path):
+    network = nx.path_graph(5)
+    path = str(tmp_path / 'rdd.npy')
+    write_rdd_matrix(network, 1, measures.global_graph_degree, path)
+    os.remove(node_order_path(path))
+    with pytest.raises(ValueError):
+        load_rdd_matrix(path, nodes=list(network))
+
+
+def test_numpy_and_tuple_labels(tmp_path):
+    # labels read with pandas are NumPy scalars
+    network = nx.relabel_nodes(nx.path_graph(6), {i: np.int64(10 * i) for i in range(6)})
+    network.add_edge(np.int64(50), ('a', 1))
+    path = str(tmp_path / 'rdd.npy')
+    write_rdd_matrix(network, 2, measures.global_graph_degree, path)
+    assert load_rdd_nodes(path) == [0, 10, 20, 30, 40, 50, ['a', 1]]
+    assert load_rdd_matrix(path, nodes=list(network)).shape == (7, 7)
+
+
+def test_unstorable_labels_fail_before_writing(tmp_path):
+    network = nx.Graph([(frozenset([1]), 2)])
+    path = str(tmp_path / 'rdd.npy')
+    with pytest.raises(TypeError):
+        write_rdd_matrix(network, 1, measures.global_graph_degree, path)
+    assert not os.path.exists(path)
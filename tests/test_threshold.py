@@ -0,0 +1,47 @@
+"""Checks the early-exit threshold queries against the full RDD."""
+import networkx as nx
+import numpy as np
+import pytest
+from reference import reference_matrix
+from rdd import measures
+from rdd.threshold import rdd_filter, rdd_within
+
+
+MEASURES = [measures.global_graph_degree, measures.global_graph_triangles,
+            measures.local_graph_degree, measures.local_path_degree]
+
+
+def thresholds(rdds):
+    # halfway between distinct values, away from rounding at the boundary
+    values = np.unique(rdds)
+    middles = values[:-1] + np.diff(values) / 2
+    picks = np.linspace(0, len(middles) - 1, 5).astype(int)
+    return [0.0, -1.0, values[-1] + 1] + middles[picks].tolist()
+
+
+@pytest.mark.parametrize('measure', MEASURES, ids=lambda m: m.__name__)
+@pytest.mark.parametrize('radius', [1, 2, None])
+def test_filter_matches_full_rdd(measure, radius):
+    network = nx.karate_club_graph()
+    nodes = list(network)
+    expected = reference_matrix(network, measure, radius)
+    for u in [0, 16, 33]:
+        for eps in thresholds(expected[u]):
+            within = [v for v, rdd in zip(nodes, expected[u]) if rdd <= eps]
+            assert rdd_filter(network, u, nodes, measure, radius, eps) == within
+            assert rdd_filter(network, u, nodes[::-1], measure, radius, eps) == within[::-1]
+            for v in [0, 5, 25]:
+                assert rdd_within(network, u, v, measure, radius, eps) == (expected[u, v] <= eps)
+
+
+@pytest.mark.parametrize('measure', [measures.global_graph_degree, measures.local_graph_degree],
+                         ids=lambda m: m.__name__)
+def test_within_on_components_of_different_depth(measure):
+    # the CRDs end at different radii, the shorter one keeps its last value
+    network = nx.disjoint_union(nx.path_graph(9), nx.star_graph(5))
+    nodes = list(network)
+    expected = reference_matrix(network, measure, None)
+    for u in [0, 4, 9, 10]:
+        for eps in thresholds(expected[u]):
+            for i, v in enumerate(nodes):
+                assert rdd_within(network, u, v, measure, None, eps) == (expected[u, i] <= eps)
@@ -0,0 +1,31 @@
+"""Checks the path measures against NetworkX on the shortest path tree."""
+import networkx as nx
+import numpy as np
+import pytest
+from rdd import measures
+from rdd.RDD import paths_to_graph, populate_node_list
+
+
+PATH_MEASURES = [
+    (measures.local_path_degree, lambda tree: dict(tree.degree)),
+    (measures.local_path_triangles, nx.triangles),
+    (measures.local_path_clique, lambda tree: {
+        node: sum(node in clique for clique in nx.find_cliques(tree)) for node in tree}),
+    (measures.local_path_harmonic_centrality, nx.harmonic_centrality),
+    (measures.local_path_katz_centrality, nx.katz_centrality),
+    (measures.local_path_pagerank, lambda tree: nx.pagerank(tree, max_iter=1000)),
+]
+
+
+@pytest.mark.parametrize('measure, reference', PATH_MEASURES,
+                         ids=lambda m: getattr(m, '__name__', ''))
+@pytest.mark.parametrize('radius', [1, 2, 3])
+def test_path_measures_match_networkx_on_the_tree(measure, reference, radius):
+    network = nx.karate_club_graph()
+    for u in [0, 5, 16, 33]:
+        paths = nx.single_source_shortest_path(network, u, radius)
+        expected = reference(paths_to_graph(paths))
+        node_list = populate_node_list(paths)
+        values = measure(network, node_list)
+        np.testing.assert_allclose(values, [expected[name] for name in node_list.names],
+                                   rtol=1e-4, atol=1e-6)